@@ -5,6 +5,9 @@ import logging
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_NAME, Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.discovery import async_load_platform
+from homeassistant.helpers.typing import ConfigType
 
 from .const import (
     CONF_ACTIVITY,
@@ -15,15 +18,28 @@ from .const import (
     CONF_LAST_TIME_SENSOR,
     CONF_LIVING_ENVIRONMENT,
     CONF_MORPHOLOGY,
+    CONF_OUTLIER_WINDOW,
+    CONF_REFRESH_COOLDOWN,
     CONF_REPRODUCTIVE,
+    CONF_SHARED_SCALE,
     CONF_TEMPERAMENT,
     CONF_WEIGHT_SENSOR,
+    DEFAULT_OUTLIER_WINDOW,
+    DEFAULT_REFRESH_COOLDOWN,
+    DEFAULT_SHARED_SCALE,
+    DOMAIN,
     STARTUP_MESSAGE,
 )
 from .coordinator import BodyPetScaleCoordinator
+from .factor_overrides import async_setup_factor_overrides
+from .history import WeightHistoryStore
+from .household import async_get_household
+from .scheduler import async_get_life_stage_scheduler
+from .services import async_setup_services
 from .util import PetScaleConfig, get_config_option
 
 PLATFORMS = [Platform.SENSOR]
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -42,9 +58,26 @@ def build_pet_config(entry: ConfigEntry) -> PetScaleConfig:
         name=entry.data.get(CONF_NAME, ""),
         reproductive=entry.data.get(CONF_REPRODUCTIVE, ""),
         temperament=entry.data.get(CONF_TEMPERAMENT, ""),
+        refresh_cooldown=entry.options.get(
+            CONF_REFRESH_COOLDOWN, DEFAULT_REFRESH_COOLDOWN
+        ),
+        outlier_window=int(
+            entry.options.get(CONF_OUTLIER_WINDOW, DEFAULT_OUTLIER_WINDOW)
+        ),
+        shared_scale=entry.options.get(CONF_SHARED_SCALE, DEFAULT_SHARED_SCALE),
     )
 
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the BodyPetScale factor overrides, services and household sensors."""
+    await async_setup_factor_overrides(hass)
+    async_setup_services(hass)
+    hass.async_create_task(
+        async_load_platform(hass, Platform.SENSOR, DOMAIN, {}, config)
+    )
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up BodyPetScale from a config entry."""
     _LOGGER.info(STARTUP_MESSAGE)
@@ -56,11 +89,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         return False
 
     config = build_pet_config(entry)
-    coordinator = BodyPetScaleCoordinator(hass, config)
+    coordinator = BodyPetScaleCoordinator(
+        hass, config, history_store=WeightHistoryStore(hass, entry.entry_id)
+    )
 
+    await coordinator.async_load_history()
     await coordinator.async_config_entry_first_refresh()
 
     hass.data.setdefault(entry.domain, {})[entry.entry_id] = coordinator
+    # Every subscription of the entry is registered with async_on_unload so a
+    # reload tears it down instead of leaving it refreshing a stale coordinator.
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    entry.async_on_unload(async_get_life_stage_scheduler(hass).async_add(coordinator))
+    entry.async_on_unload(
+        async_get_household(hass).async_add(entry.entry_id, coordinator)
+    )
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     return True
@@ -70,10 +113,16 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[entry.domain].pop(entry.entry_id)
+        coordinator = hass.data[entry.domain].pop(entry.entry_id)
+        await coordinator.async_shutdown()
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored data of a deleted config entry."""
+    await WeightHistoryStore(hass, entry.entry_id).async_remove()
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload the config entry when options are updated."""
     await hass.config_entries.async_reload(entry.entry_id)
@@ -0,0 +1,201 @@
+"""Breed search module.
+
+Breed keys and their translated labels are indexed once: every word of every
+name goes into a sorted word list searched by bisection for prefixes, and
+every name into a trigram index for typo tolerant matching. A query then only
+looks at the names sharing a word prefix or a trigram with it.
+"""
+
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.translation import async_get_translations
+
+from .const import BREED_OPTIONS, DOMAIN
+
+DATA_BREED_INDEX = f"{DOMAIN}_breed_index"
+DEFAULT_SEARCH_LIMIT = 10
+MIN_FUZZY_SCORE = 0.3
+
+_SCORE_EXACT = 1.0
+_SCORE_NAME_PREFIX = 0.9
+_SCORE_WORD_PREFIX = 0.8
+# Fuzzy scores are scaled below any prefix match.
+_FUZZY_WEIGHT = 0.7
+
+
+def normalize(text: str) -> str:
+    """Return text lowercased, without accents and with words split by spaces."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return " ".join(
+        "".join(
+            char if char.isalnum() else " "
+            for char in decomposed
+            if not unicodedata.combining(char)
+        ).split()
+    )
+
+
+def _trigrams(text: str) -> set[str]:
+    """Return the trigrams of a normalized text, padded at both ends."""
+    padded = f"  {text} "
+    return {padded[index : index + 3] for index in range(len(padded) - 2)}
+
+
+@dataclass(frozen=True)
+class BreedMatch:
+    """Breed matching a search, with its relevance between 0 and 1."""
+
+    breed: str
+    label: str
+    animal_type: str | None
+    score: float
+
+
+class BreedIndex:
+    """Prefix and trigram index over breed keys and labels."""
+
+    def __init__(
+        self,
+        labels: Mapping[str, Iterable[str]],
+        animal_types: Mapping[str, str],
+    ) -> None:
+        self._breeds = tuple(labels)
+        self._animal_types = animal_types
+        self._display: list[str] = []
+        # Normalized names of each breed, the key first, and their trigrams.
+        self._names: list[list[str]] = []
+        self._name_trigrams: list[list[set[str]]] = []
+        words: list[tuple[str, int]] = []
+        trigram_index: defaultdict[str, set[int]] = defaultdict(set)
+
+        for breed_id, breed in enumerate(self._breeds):
+            breed_labels = [label for label in labels[breed] if label]
+            self._display.append(breed_labels[0] if breed_labels else breed)
+            names = list(
+                dict.fromkeys(
+                    normalize(name) for name in (breed.replace("_", " "), *breed_labels)
+                )
+            )
+            name_trigrams = [_trigrams(name) for name in names]
+            self._names.append(names)
+            self._name_trigrams.append(name_trigrams)
+            for name in names:
+                words.extend((word, breed_id) for word in name.split())
+            for trigrams in name_trigrams:
+                for trigram in trigrams:
+                    trigram_index[trigram].add(breed_id)
+
+        words.sort()
+        self._words = [word for word, _ in words]
+        self._word_breeds = [breed_id for _, breed_id in words]
+        self._trigram_index = dict(trigram_index)
+
+    def __len__(self) -> int:
+        """Return the number of breeds indexed."""
+        return len(self._breeds)
+
+    def search(
+        self,
+        query: str,
+        animal_type: str | None = None,
+        limit: int = DEFAULT_SEARCH_LIMIT,
+    ) -> list[BreedMatch]:
+        """Return the breeds best matching query, most relevant first."""
+        text = normalize(query)
+        if not text:
+            return []
+
+        scores: dict[int, float] = {}
+        for breed_id in self._prefix_candidates(text):
+            scores[breed_id] = self._prefix_score(breed_id, text)
+
+        query_trigrams = _trigrams(text)
+        fuzzy_candidates: set[int] = set()
+        for trigram in query_trigrams:
+            fuzzy_candidates |= self._trigram_index.get(trigram, set())
+        for breed_id in fuzzy_candidates - scores.keys():
+            score = _FUZZY_WEIGHT * max(
+                2
+                * len(query_trigrams & name_trigrams)
+                / (len(query_trigrams) + len(name_trigrams))
+                for name_trigrams in self._name_trigrams[breed_id]
+            )
+            if score >= _FUZZY_WEIGHT * MIN_FUZZY_SCORE:
+                scores[breed_id] = score
+
+        matches = [
+            BreedMatch(
+                breed=self._breeds[breed_id],
+                label=self._display[breed_id],
+                animal_type=self._animal_types.get(self._breeds[breed_id]),
+                score=round(score, 3),
+            )
+            for breed_id, score in scores.items()
+            if animal_type is None
+            or self._animal_types.get(self._breeds[breed_id]) == animal_type
+        ]
+        matches.sort(key=lambda match: (-match.score, match.label))
+        return matches[:limit]
+
+    def _prefix_candidates(self, text: str) -> set[int]:
+        """Return the breeds having a word starting with every query word."""
+        candidates: set[int] | None = None
+        for query_word in text.split():
+            found = set()
+            index = bisect_left(self._words, query_word)
+            while index < len(self._words) and self._words[index].startswith(
+                query_word
+            ):
+                found.add(self._word_breeds[index])
+                index += 1
+            candidates = found if candidates is None else candidates & found
+            if not candidates:
+                return set()
+        return candidates or set()
+
+    def _prefix_score(self, breed_id: int, text: str) -> float:
+        """Return the score of a breed whose words start with the query words."""
+        names = self._names[breed_id]
+        if text in names:
+            return _SCORE_EXACT
+        if any(name.startswith(text) for name in names):
+            return _SCORE_NAME_PREFIX
+        return _SCORE_WORD_PREFIX
+
+
+def build_breed_index(*translations: Mapping[str, str]) -> BreedIndex:
+    """Build the breed index from translations of the selector options.
+
+    Labels of every translation are searchable, the first one is displayed.
+    """
+    prefix = f"component.{DOMAIN}.selector.breed_options.options."
+    animal_types = {
+        breed: animal_type
+        for animal_type, breeds in BREED_OPTIONS.items()
+        for breed in breeds
+    }
+    labels = {
+        breed: [strings.get(f"{prefix}{breed}", "") for strings in translations]
+        for breed in animal_types
+    }
+    return BreedIndex(labels, animal_types)
+
+
+async def async_get_breed_index(hass: HomeAssistant, language: str) -> BreedIndex:
+    """Return the breed index of a language, built on first use.
+
+    English labels are indexed too, so they match whatever the language.
+    """
+    indexes: dict[str, BreedIndex] = hass.data.setdefault(DATA_BREED_INDEX, {})
+    if (index := indexes.get(language)) is None:
+        translations = [
+            await async_get_translations(hass, lang, "selector", [DOMAIN])
+            for lang in dict.fromkeys((language, "en"))
+        ]
+        index = indexes[language] = build_breed_index(*translations)
+    return index
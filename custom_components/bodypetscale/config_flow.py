@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import logging
-from types import MappingProxyType
+from functools import lru_cache
 from typing import Any
 
 import voluptuous as vol
@@ -30,9 +30,15 @@ from .const import (
     CONF_LAST_TIME_SENSOR,
     CONF_LIVING_ENVIRONMENT,
     CONF_MORPHOLOGY,
+    CONF_OUTLIER_WINDOW,
+    CONF_REFRESH_COOLDOWN,
     CONF_REPRODUCTIVE,
+    CONF_SHARED_SCALE,
     CONF_TEMPERAMENT,
     CONF_WEIGHT_SENSOR,
+    DEFAULT_OUTLIER_WINDOW,
+    DEFAULT_REFRESH_COOLDOWN,
+    DEFAULT_SHARED_SCALE,
     DOG_APPETITE_OPTIONS,
     DOMAIN,
     LIVING_ENVIRONMENT_OPTIONS,
@@ -40,23 +46,25 @@ from .const import (
     MORPHOLOGY_URL,
     REPRODUCTIVE_STATUS,
 )
+from .outliers import MIN_OUTLIER_SAMPLES
 
 _LOGGER = logging.getLogger(__name__)
 
+SCHEMA_CACHE_SIZE = 32
 
-def get_options_schema(
-    defaults: dict[str, Any] | MappingProxyType[str, Any],
-    animal_type: str,
-) -> vol.Schema:
-    """Return the options schema."""
 
+@lru_cache(maxsize=SCHEMA_CACHE_SIZE)
+def get_options_schema(animal_type: str) -> vol.Schema:
+    """Return the options schema of an animal type, cached.
+
+    The schema holds no value of a pet, the flows show the current values as
+    suggested values so the cached schema is shared by every pet.
+    """
     living_environment_options = LIVING_ENVIRONMENT_OPTIONS.get(animal_type, [])
 
     return vol.Schema(
         {
-            vol.Required(
-                CONF_LIVING_ENVIRONMENT, default=defaults.get(CONF_LIVING_ENVIRONMENT)
-            ): selector.SelectSelector(
+            vol.Required(CONF_LIVING_ENVIRONMENT): selector.SelectSelector(
                 selector.SelectSelectorConfig(
                     options=living_environment_options,
                     mode=selector.SelectSelectorMode.DROPDOWN,
@@ -64,33 +72,99 @@ def get_options_schema(
                     sort=True,
                 )
             ),
-            vol.Required(
-                CONF_MORPHOLOGY, default=defaults.get(CONF_MORPHOLOGY)
-            ): selector.SelectSelector(
+            vol.Required(CONF_MORPHOLOGY): selector.SelectSelector(
                 selector.SelectSelectorConfig(
                     options=MORPHOLOGY_OPTIONS,
                     mode=selector.SelectSelectorMode.DROPDOWN,
                     translation_key="morphology",
                 )
             ),
-            vol.Required(
-                CONF_WEIGHT_SENSOR,
-                default=defaults.get(CONF_WEIGHT_SENSOR),
-            ): selector.EntitySelector(
+            vol.Required(CONF_WEIGHT_SENSOR): selector.EntitySelector(
                 selector.EntitySelectorConfig(
                     domain=["sensor", "input_number", "number"]
                 )
             ),
-            vol.Optional(
-                CONF_LAST_TIME_SENSOR,
-                default=defaults.get(CONF_LAST_TIME_SENSOR),
-            ): selector.EntitySelector(
+            vol.Optional(CONF_LAST_TIME_SENSOR): selector.EntitySelector(
                 selector.EntitySelectorConfig(domain=["sensor", "input_datetime"])
             ),
+            vol.Optional(
+                CONF_SHARED_SCALE,
+                default=DEFAULT_SHARED_SCALE,
+            ): selector.BooleanSelector(),
+            vol.Optional(
+                CONF_OUTLIER_WINDOW,
+                default=DEFAULT_OUTLIER_WINDOW,
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=MIN_OUTLIER_SAMPLES,
+                    max=50,
+                    step=1,
+                    mode=selector.NumberSelectorMode.BOX,
+                )
+            ),
+            vol.Optional(
+                CONF_REFRESH_COOLDOWN,
+                default=DEFAULT_REFRESH_COOLDOWN,
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=0,
+                    max=10,
+                    step=0.1,
+                    unit_of_measurement="s",
+                    mode=selector.NumberSelectorMode.BOX,
+                )
+            ),
         }
     )
 
 
+@lru_cache(maxsize=SCHEMA_CACHE_SIZE)
+def get_profile_schema(animal_type: str) -> vol.Schema:
+    """Return the profile schema of an animal type, cached."""
+    schema_dict = {
+        vol.Required(CONF_BREED): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=BREED_OPTIONS.get(animal_type, []),
+                mode=selector.SelectSelectorMode.DROPDOWN,
+                translation_key="breed_options",
+            )
+        ),
+        vol.Required(CONF_ACTIVITY): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=ACTIVITY_LEVELS.get(animal_type, []),
+                mode=selector.SelectSelectorMode.DROPDOWN,
+                translation_key="activity_level",
+            )
+        ),
+        vol.Required(CONF_REPRODUCTIVE): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=REPRODUCTIVE_STATUS,
+                mode=selector.SelectSelectorMode.DROPDOWN,
+                translation_key="reproductive_status",
+            )
+        ),
+    }
+
+    if animal_type == "cat":
+        schema_dict[vol.Required(CONF_TEMPERAMENT)] = selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=CAT_TEMPERAMENT_OPTIONS,
+                mode=selector.SelectSelectorMode.DROPDOWN,
+                translation_key="temperament",
+            )
+        )
+    else:
+        schema_dict[vol.Required(CONF_APPETITE)] = selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=DOG_APPETITE_OPTIONS,
+                mode=selector.SelectSelectorMode.DROPDOWN,
+                translation_key="appetite",
+            )
+        )
+
+    return vol.Schema(schema_dict)
+
+
 class BodyPetScaleConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for BodyPetScale."""
 
@@ -150,50 +224,9 @@ class BodyPetScaleConfigFlow(ConfigFlow, domain=DOMAIN):
             self.data.update(user_input)
             return await self.async_step_options()
 
-        schema_dict = {
-            vol.Required(CONF_BREED): selector.SelectSelector(
-                selector.SelectSelectorConfig(
-                    options=BREED_OPTIONS.get(animal_type, []),
-                    mode=selector.SelectSelectorMode.DROPDOWN,
-                    translation_key="breed_options",
-                )
-            ),
-            vol.Required(CONF_ACTIVITY): selector.SelectSelector(
-                selector.SelectSelectorConfig(
-                    options=ACTIVITY_LEVELS.get(animal_type, []),
-                    mode=selector.SelectSelectorMode.DROPDOWN,
-                    translation_key="activity_level",
-                )
-            ),
-            vol.Required(CONF_REPRODUCTIVE): selector.SelectSelector(
-                selector.SelectSelectorConfig(
-                    options=REPRODUCTIVE_STATUS,
-                    mode=selector.SelectSelectorMode.DROPDOWN,
-                    translation_key="reproductive_status",
-                )
-            ),
-        }
-
-        if animal_type == "cat":
-            schema_dict[vol.Required(CONF_TEMPERAMENT)] = selector.SelectSelector(
-                selector.SelectSelectorConfig(
-                    options=CAT_TEMPERAMENT_OPTIONS,
-                    mode=selector.SelectSelectorMode.DROPDOWN,
-                    translation_key="temperament",
-                )
-            )
-        else:
-            schema_dict[vol.Required(CONF_APPETITE)] = selector.SelectSelector(
-                selector.SelectSelectorConfig(
-                    options=DOG_APPETITE_OPTIONS,
-                    mode=selector.SelectSelectorMode.DROPDOWN,
-                    translation_key="appetite",
-                )
-            )
-
         return self.async_show_form(
             step_id="profile",
-            data_schema=vol.Schema(schema_dict),
+            data_schema=get_profile_schema(animal_type),
             errors=errors,
         )
 
@@ -215,13 +248,12 @@ class BodyPetScaleConfigFlow(ConfigFlow, domain=DOMAIN):
                 )
 
         animal_type = self.data[CONF_ANIMAL_TYPE]
-        schema = await self.hass.async_add_executor_job(
-            get_options_schema, {}, animal_type
-        )
 
         return self.async_show_form(
             step_id="options",
-            data_schema=schema,
+            data_schema=self.add_suggested_values_to_schema(
+                get_options_schema(animal_type), user_input or {}
+            ),
             errors=errors,
             description_placeholders=placeholders,
         )
@@ -239,12 +271,10 @@ class BodyPetScaleOptionsFlow(OptionsFlow):
 
         animal_type = self.config_entry.data.get(CONF_ANIMAL_TYPE, "cat")
 
-        schema = await self.hass.async_add_executor_job(
-            get_options_schema, self.config_entry.options, animal_type
-        )
-
         return self.async_show_form(
             step_id="init",
-            data_schema=schema,
+            data_schema=self.add_suggested_values_to_schema(
+                get_options_schema(animal_type), self.config_entry.options
+            ),
             description_placeholders={"learn_more_link": MORPHOLOGY_URL},
         )
@@ -15,14 +15,31 @@ CONF_BREED = "breed"
 CONF_LAST_TIME_SENSOR = "last_time_sensor"
 CONF_LIVING_ENVIRONMENT = "living_environment"
 CONF_MORPHOLOGY = "morphology"
+CONF_OUTLIER_WINDOW = "outlier_window"
+CONF_REFRESH_COOLDOWN = "refresh_cooldown"
 CONF_REPRODUCTIVE = "reproductive"
+CONF_SHARED_SCALE = "shared_scale"
 CONF_TEMPERAMENT = "temperament"
 CONF_WEIGHT_SENSOR = "weight_sensor"
 
 ATTR_BODY_TYPE = "body_type"
+ATTR_HOUSEHOLD_ENERGY_NEED = "household_energy_need"
+ATTR_HOUSEHOLD_PROBLEM_PETS = "household_problem_pets"
+ATTR_HOUSEHOLD_WEIGHT_DEVIATION = "household_weight_deviation"
 ATTR_IDEAL = "ideal_weight"
 ATTR_ENERGY_NEED = "energy_need"
+ATTR_IDEAL_WEIGHT_ETA = "ideal_weight_eta"
+ATTR_LAST_REFRESH_DURATION = "last_refresh_duration"
 ATTR_MAIN = "main"
+ATTR_REFRESH_ERRORS = "refresh_errors"
+ATTR_REFRESHES = "refreshes"
+ATTR_SMOOTHED_WEIGHT = "smoothed_weight"
+ATTR_WEIGHT_CHANGE_7D = "weight_change_7d"
+ATTR_WEIGHT_CHANGE_30D = "weight_change_30d"
+
+DEFAULT_OUTLIER_WINDOW = 7
+DEFAULT_REFRESH_COOLDOWN = 0.5
+DEFAULT_SHARED_SCALE = False
 
 ACTIVITY_LEVELS = {
     "dog": [
@@ -1,26 +1,72 @@
 """Coordinator for the BodyPetScale integration."""
 
 import logging
-from datetime import datetime
+import time
+from datetime import date, datetime
 from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.util import dt as dt_util
 from homeassistant.util.dt import parse_datetime
 
-from .const import CONF_LAST_TIME_SENSOR, CONF_WEIGHT_SENSOR
-from .util import (
+from .const import (
+    ATTR_BODY_TYPE,
+    ATTR_ENERGY_NEED,
+    ATTR_IDEAL,
+    ATTR_IDEAL_WEIGHT_ETA,
+    ATTR_SMOOTHED_WEIGHT,
+    ATTR_WEIGHT_CHANGE_7D,
+    ATTR_WEIGHT_CHANGE_30D,
+    CONF_LAST_TIME_SENSOR,
+    CONF_WEIGHT_SENSOR,
+)
+from .core.calculations import (
     EnergyConfig,
-    PetScaleConfig,
     calculate_energy_need,
     calculate_ideal_weight,
-    get_cat_age_stage,
-    get_dog_age_stage,
+    get_cat_life_stage,
+    get_dog_life_stage,
 )
+from .core.factors import overrides_version
+from .core.life_stage import LifeStageSchedule
+from .graph import DependencyGraph
+from .history import WeightHistory, WeightHistoryStore
+from .outliers import WeightOutlierFilter
+from .refresh_stats import RefreshStats
+from .trend import TrendSnapshot, WeightTrend, days_to_reach
+from .util import PetScaleConfig
 
 _LOGGER = logging.getLogger(__name__)
 
+_INPUT_WEIGHT = "weight"
+_INPUT_LAST_TIME = "last_time"
+_INPUT_AGE_MONTHS = "age_months"
+_INPUT_PROFILE = "profile"
+_INPUT_TREND = "trend"
+_INPUT_FACTORS_VERSION = "factors_version"
+_NODE_STAGE_WEIGHT = "stage_weight"
+_NODE_LIFE_STAGE = "life_stage"
+_NODE_ENERGY_CONFIG = "energy_config"
+_OUTPUTS = frozenset(
+    {
+        ATTR_IDEAL,
+        ATTR_BODY_TYPE,
+        ATTR_ENERGY_NEED,
+        CONF_LAST_TIME_SENSOR,
+        ATTR_SMOOTHED_WEIGHT,
+        ATTR_WEIGHT_CHANGE_7D,
+        ATTR_WEIGHT_CHANGE_30D,
+        ATTR_IDEAL_WEIGHT_ETA,
+    }
+)
+
+
+def _round_or_none(value: float | None) -> float | None:
+    """Round a trend value to 2 decimals, keeping None."""
+    return None if value is None else round(value, 2)
+
 
 async def _get_state_as_float(hass: HomeAssistant, entity_id: str) -> float | None:
     """Get the state of a sensor as a float, return None if invalid."""
@@ -34,6 +80,17 @@ async def _get_state_as_float(hass: HomeAssistant, entity_id: str) -> float | No
         return None
 
 
+def _measurement_timestamp(last_time: str | None) -> float | None:
+    """Return the timestamp of a last time state, None if missing or invalid."""
+    if not last_time:
+        return None
+    try:
+        measured_at = parse_datetime(last_time)
+    except ValueError:
+        return None
+    return None if measured_at is None else measured_at.timestamp()
+
+
 async def _get_state_as_string(hass: HomeAssistant, entity_id: str) -> str | None:
     """Retrieve the state of an entity as a string."""
     state = hass.states.get(entity_id)
@@ -45,103 +102,417 @@ async def _get_state_as_string(hass: HomeAssistant, entity_id: str) -> str | Non
 class BodyPetScaleCoordinator(DataUpdateCoordinator):
     """Coordinator for the BodyPetScale integration."""
 
-    def __init__(self, hass: HomeAssistant, config: PetScaleConfig) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config: PetScaleConfig,
+        history_store: WeightHistoryStore | None = None,
+    ) -> None:
+        debouncer = Debouncer(
+            hass, _LOGGER, cooldown=config.refresh_cooldown, immediate=False
+        )
         super().__init__(
             hass,
             logger=_LOGGER,
             name="BodyPetScaleCoordinator",
+            always_update=False,
+            request_refresh_debouncer=debouncer,
         )
+        # Count the refreshes run by the debouncer, the other requests were
+        # merged into them.
+        debouncer.function = self._async_run_requested_refresh
         self.config = config
         self._last_time: datetime | None = None
+        self.refresh_requests = 0
+        self.requested_refreshes = 0
+        self.changed_outputs: frozenset[str] = frozenset()
+        self.skipped_writes = 0
+        self.refresh_stats = RefreshStats()
+        self._refresh_listeners: list[CALLBACK_TYPE] = []
+        self._life_stage_schedule: LifeStageSchedule | None = None
+        self._age_months: int | None = None
+        try:
+            self._life_stage_schedule = LifeStageSchedule.from_birthday(
+                config.animal_type, config.birthday
+            )
+            self._age_months = self._life_stage_schedule.age_months_at(
+                dt_util.now().date()
+            )
+        except ValueError as e:
+            _LOGGER.warning("No life stage for %s: %s", config.name, e)
+        self._graph = self._build_graph()
+        self.history = WeightHistory()
+        self.trend = WeightTrend()
+        self._history_store = history_store
+        self.outlier_filter = WeightOutlierFilter(config.outlier_window)
+        self._last_reading: tuple[float, str | None] | None = None
+        self._weight_rejected = False
+        self._shared_reading: tuple[float, str] | None = None
 
     @property
     def last_time(self) -> datetime | None:
         """Return the last time measurement."""
         return self._last_time
 
-    async def _async_update_data(self) -> dict:
-        """Fetch and calculate data for pet scale sensors."""
-        weight = await _get_state_as_float(self.hass, self.config.weight_sensor)
-        last_time = (
-            await _get_state_as_string(self.hass, self.config.last_time_sensor)
-            if self.config.last_time_sensor
-            else None
-        )
+    async def async_load_history(self) -> None:
+        """Load the stored weight history and trend accumulators."""
+        if self._history_store is None:
+            return
+        data = await self._history_store.async_load()
+        self.history = WeightHistory.from_dict(data)
+        self.trend = WeightTrend.from_dict(data.get("trend", {}))
+        weights = [weight for _, weight in self.history]
+        self.outlier_filter.seed(weights[-self.outlier_filter.window :])
 
-        data: dict[str, Any] = {
-            CONF_WEIGHT_SENSOR: weight,
-        }
+    @callback
+    def async_set_shared_reading(self, weight: float, measured_at: datetime) -> None:
+        """Take a shared scale reading identified as this pet and refresh."""
+        self._shared_reading = (weight, measured_at.isoformat())
+        self.async_schedule_refresh()
 
-        self._process_weight_data(weight, data)
-        self._process_last_time_data(last_time, data)
+    def _get_shared_reading(self) -> tuple[float | None, str | None]:
+        """Return the weight and time of the last shared scale reading of the pet.
 
-        if weight is not None and data.get("ideal_weight") is not None:
-            self._process_energy_need(weight, data)
+        Until one is identified, the latest recorded weight is used.
+        """
+        if self._shared_reading is not None:
+            return self._shared_reading
+        latest = self.history.latest()
+        if latest is None:
+            return None, None
+        timestamp, weight = latest
+        return weight, dt_util.utc_from_timestamp(timestamp).isoformat()
 
-        return data
+    def _is_rejected_reading(self, weight: float | None, last_time: str | None) -> bool:
+        """Return whether weight is a reading discarded by the outlier filter.
 
-    def _process_weight_data(self, weight: float | None, data: dict[str, Any]) -> None:
-        if weight is not None:
-            data["ideal_weight"] = calculate_ideal_weight(
-                weight, self.config.morphology, self.config.animal_type
-            )
-            data["body_type"] = self.config.morphology
-        else:
-            data["ideal_weight"] = None
-            data["body_type"] = None
+        Only new readings go through the filter, a rejected reading stays
+        rejected for as long as the weight sensor keeps reporting it. A new
+        last time makes the same weight a new reading, so a weigh-in repeating
+        the previous weight still counts.
+        """
+        if weight is None:
+            self._last_reading = None
+            self._weight_rejected = False
+            return False
 
-    def _process_last_time_data(
-        self, last_time_str: str | None, data: dict[str, Any]
-    ) -> None:
-        if not last_time_str:
-            data[CONF_LAST_TIME_SENSOR] = None
+        if (weight, last_time) != self._last_reading:
+            self._last_reading = (weight, last_time)
+            self._weight_rejected = not self.outlier_filter.accept(weight)
+            if self._weight_rejected:
+                _LOGGER.warning(
+                    "Discarding implausible weight %s for %s", weight, self.config.name
+                )
+        return self._weight_rejected
+
+    @callback
+    def _async_record_weight(self, weight: float, last_time: str | None) -> None:
+        """Add a weigh-in to the history and trend, if it is a new measurement.
+
+        A weigh-in is new when its last time is after the latest sample, which
+        it is stamped with. Without a last time, only a change of weight makes
+        a new weigh-in, stamped with the current time. Either way a restart or
+        an unavailable sensor coming back does not record the weight again.
+        """
+        latest = self.history.latest()
+        timestamp = _measurement_timestamp(last_time)
+        if timestamp is None:
+            if latest is not None and latest[1] == weight:
+                return
+            timestamp = dt_util.utcnow().timestamp()
+        elif latest is not None and timestamp <= latest[0]:
             return
+        self.history.append(timestamp, weight)
+        self.trend.add(timestamp, weight)
+        if self._history_store is not None:
+            self._history_store.async_schedule_save(self._storage_data)
+
+    def _storage_data(self) -> dict[str, Any]:
+        """Return the weight history and trend accumulators to store."""
+        return {**self.history.as_dict(), "trend": self.trend.as_dict()}
+
+    @property
+    def life_stage_schedule(self) -> LifeStageSchedule | None:
+        """Return the life stage schedule, None if the pet has none."""
+        return self._life_stage_schedule
+
+    @callback
+    def async_set_age(self, today: date) -> None:
+        """Move the age to today and refresh if a life stage threshold was crossed."""
+        if self._life_stage_schedule is None:
+            return
+        age_months = self._life_stage_schedule.age_months_at(today)
+        if age_months != self._age_months:
+            self._age_months = age_months
+            self.async_schedule_refresh()
+
+    @property
+    def merged_refresh_requests(self) -> int:
+        """Return the refresh requests merged into another, or still pending."""
+        return self.refresh_requests - self.requested_refreshes
+
+    @callback
+    def async_schedule_refresh(self) -> None:
+        """Request a refresh from a callback, debounced by refresh_cooldown."""
+        self.hass.async_create_task(self.async_request_refresh(), eager_start=True)
+
+    async def async_request_refresh(self) -> None:
+        """Request a refresh, merged with those received within the cooldown."""
+        self.refresh_requests += 1
+        await super().async_request_refresh()
 
+    async def _async_run_requested_refresh(self) -> None:
+        """Run a refresh requested through the debouncer."""
+        self.requested_refreshes += 1
+        await self.async_refresh()
+
+    async def async_shutdown(self) -> None:
+        """Save the history and shut down the coordinator."""
+        if self._history_store is not None:
+            await self._history_store.async_save(self._storage_data())
+        await super().async_shutdown()
+
+    @callback
+    def async_add_refresh_listener(
+        self, update_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Call update_callback after every refresh, even one leaving data unchanged."""
+        self._refresh_listeners.append(update_callback)
+
+        @callback
+        def _async_remove() -> None:
+            self._refresh_listeners.remove(update_callback)
+
+        return _async_remove
+
+    def _build_graph(self) -> DependencyGraph:
+        """Build the dependency graph of the coordinator outputs."""
+        graph = DependencyGraph()
+        graph.add_input(_INPUT_WEIGHT)
+        graph.add_input(_INPUT_LAST_TIME)
+        graph.add_input(_INPUT_AGE_MONTHS)
+        graph.add_input(_INPUT_PROFILE, self.config)
+        graph.add_input(_INPUT_TREND, TrendSnapshot())
+        graph.add_input(_INPUT_FACTORS_VERSION, overrides_version())
+
+        graph.add_node(
+            ATTR_IDEAL, (_INPUT_WEIGHT, _INPUT_PROFILE), self._compute_ideal_weight
+        )
+        graph.add_node(
+            ATTR_BODY_TYPE, (_INPUT_WEIGHT, _INPUT_PROFILE), self._compute_body_type
+        )
+        graph.add_node(
+            _NODE_STAGE_WEIGHT,
+            (_INPUT_WEIGHT, _INPUT_PROFILE),
+            self._compute_stage_weight,
+        )
+        graph.add_node(
+            _NODE_LIFE_STAGE,
+            (_INPUT_AGE_MONTHS, _NODE_STAGE_WEIGHT, _INPUT_PROFILE),
+            self._compute_life_stage,
+        )
+        graph.add_node(
+            _NODE_ENERGY_CONFIG,
+            (_NODE_LIFE_STAGE, _INPUT_PROFILE),
+            self._compute_energy_config,
+        )
+        graph.add_node(
+            ATTR_ENERGY_NEED,
+            (ATTR_IDEAL, _NODE_ENERGY_CONFIG, _INPUT_FACTORS_VERSION),
+            self._compute_energy_need,
+        )
+        graph.add_node(
+            CONF_LAST_TIME_SENSOR, (_INPUT_LAST_TIME,), self._compute_last_time
+        )
+        graph.add_node(
+            ATTR_SMOOTHED_WEIGHT,
+            (_INPUT_TREND,),
+            lambda trend: _round_or_none(trend.smoothed),
+        )
+        graph.add_node(
+            ATTR_WEIGHT_CHANGE_7D,
+            (_INPUT_TREND,),
+            lambda trend: _round_or_none(trend.change_7d),
+        )
+        graph.add_node(
+            ATTR_WEIGHT_CHANGE_30D,
+            (_INPUT_TREND,),
+            lambda trend: _round_or_none(trend.change_30d),
+        )
+        graph.add_node(ATTR_IDEAL_WEIGHT_ETA, (ATTR_IDEAL, _INPUT_TREND), days_to_reach)
+        return graph
+
+    async def _async_update_data(self) -> dict:
+        """Fetch and calculate data, recording how long the refresh took."""
+        start = time.perf_counter()
+        # Nothing changed unless the refresh gets to compute the outputs.
+        self.changed_outputs = frozenset()
+        error = True
         try:
-            dt = parse_datetime(last_time_str)
-            if dt:
-                self._last_time = dt.astimezone(dt_util.DEFAULT_TIME_ZONE)
-                data[CONF_LAST_TIME_SENSOR] = self._last_time
-            else:
-                _LOGGER.warning("Conversion error for 'last_time': %s", last_time_str)
-                data[CONF_LAST_TIME_SENSOR] = None
-        except ValueError as e:
-            _LOGGER.warning("Invalid format for 'last_time': %s - %s", last_time_str, e)
-            data[CONF_LAST_TIME_SENSOR] = None
+            data = await self._async_compute_data()
+            error = False
+        finally:
+            duration = time.perf_counter() - start
+            slow = self.refresh_stats.record(
+                duration, changed=bool(self.changed_outputs), error=error
+            )
+            if slow:
+                _LOGGER.warning(
+                    "Refreshing %s blocked the event loop for %.3f seconds",
+                    self.config.name,
+                    duration,
+                )
+        return data
+
+    async def _async_refresh(self, *args: Any, **kwargs: Any) -> None:
+        """Refresh, then call the refresh listeners once the result is stored.
 
-    def _process_energy_need(self, weight: float, data: dict[str, Any]) -> None:
-        if self.config.animal_type == "cat":
-            life_stage = get_cat_age_stage(self.config.birthday)
-        elif self.config.animal_type == "dog":
-            life_stage = get_dog_age_stage(self.config.birthday, weight)
+        The data listeners only run when the data changed, the refresh
+        statistics change with every refresh.
+        """
+        await super()._async_refresh(*args, **kwargs)
+        for update_callback in list(self._refresh_listeners):
+            update_callback()
+
+    async def _async_compute_data(self) -> dict:
+        """Fetch and calculate data for pet scale sensors.
+
+        Only the outputs depending on an input that changed since the previous
+        update are recomputed; their names are kept in changed_outputs.
+        """
+        # A shared scale reports the weighings of several pets, only those
+        # identified as this pet are used, along with their own time.
+        if self.config.shared_scale:
+            weight, last_time = self._get_shared_reading()
         else:
-            _LOGGER.warning("Unknown animal type: %s", self.config.animal_type)
-            return
+            weight = await _get_state_as_float(self.hass, self.config.weight_sensor)
+            last_time = (
+                await _get_state_as_string(self.hass, self.config.last_time_sensor)
+                if self.config.last_time_sensor
+                else None
+            )
+        if self._is_rejected_reading(weight, last_time):
+            if self.data is not None:
+                # Unchanged data, so no entity writes the rejected reading.
+                self.changed_outputs = frozenset()
+                return self.data
+            weight = None
+
+        graph = self._graph
+        weight_changed = graph.set_input(_INPUT_WEIGHT, weight)
+        if weight is not None:
+            self._async_record_weight(weight, last_time)
+        graph.set_input(_INPUT_LAST_TIME, last_time)
+        graph.set_input(_INPUT_AGE_MONTHS, self._age_months)
+        graph.set_input(_INPUT_PROFILE, self.config)
+        graph.set_input(_INPUT_TREND, self.trend.snapshot())
+        graph.set_input(_INPUT_FACTORS_VERSION, overrides_version())
+
+        changed = graph.recompute() & _OUTPUTS
+        if weight_changed:
+            changed.add(CONF_WEIGHT_SENSOR)
+        self.changed_outputs = frozenset(changed)
+
+        data: dict[str, Any] = {
+            CONF_WEIGHT_SENSOR: weight,
+            ATTR_IDEAL: graph[ATTR_IDEAL],
+            ATTR_BODY_TYPE: graph[ATTR_BODY_TYPE],
+            CONF_LAST_TIME_SENSOR: graph[CONF_LAST_TIME_SENSOR],
+            ATTR_SMOOTHED_WEIGHT: graph[ATTR_SMOOTHED_WEIGHT],
+            ATTR_WEIGHT_CHANGE_7D: graph[ATTR_WEIGHT_CHANGE_7D],
+            ATTR_WEIGHT_CHANGE_30D: graph[ATTR_WEIGHT_CHANGE_30D],
+            ATTR_IDEAL_WEIGHT_ETA: graph[ATTR_IDEAL_WEIGHT_ETA],
+        }
+        if graph[ATTR_ENERGY_NEED] is not None:
+            data[ATTR_ENERGY_NEED] = graph[ATTR_ENERGY_NEED]
+
+        return data
+
+    @staticmethod
+    def _compute_ideal_weight(
+        weight: float | None, profile: PetScaleConfig
+    ) -> float | None:
+        if weight is None:
+            return None
+        return calculate_ideal_weight(weight, profile.morphology, profile.animal_type)
+
+    @staticmethod
+    def _compute_body_type(weight: float | None, profile: PetScaleConfig) -> str | None:
+        if weight is None:
+            return None
+        return profile.morphology
+
+    @staticmethod
+    def _compute_stage_weight(
+        weight: float | None, profile: PetScaleConfig
+    ) -> float | None:
+        """Return the weight the life stage depends on, only dogs have one."""
+        return weight if profile.animal_type == "dog" else None
+
+    @staticmethod
+    def _compute_life_stage(
+        age_months: int | None, stage_weight: float | None, profile: PetScaleConfig
+    ) -> str | None:
+        if age_months is None:
+            return None
+        if profile.animal_type == "cat":
+            return get_cat_life_stage(age_months)
+        if profile.animal_type == "dog" and stage_weight is not None:
+            return get_dog_life_stage(age_months, stage_weight)
+        return None
+
+    @staticmethod
+    def _compute_energy_config(
+        life_stage: str | None, profile: PetScaleConfig
+    ) -> EnergyConfig | None:
+        if profile.animal_type not in ("cat", "dog"):
+            _LOGGER.warning("Unknown animal type: %s", profile.animal_type)
+            return None
 
         if not life_stage:
+            return None
+
+        return EnergyConfig(
+            animal_type=profile.animal_type,
+            breed=profile.breed,
+            life_stage=life_stage,
+            activity=profile.activity,
+            reproductive=profile.reproductive,
+            morphology=profile.morphology,
+            environment=profile.environment,
+            appetite=profile.appetite,
+            temperament=profile.temperament,
+        )
+
+    def _compute_energy_need(
+        self,
+        ideal_weight: float | None,
+        config: EnergyConfig | None,
+        _factors_version: int,
+    ) -> int | None:
+        """Return the energy need, recomputed when the factor overrides change."""
+        if ideal_weight is None:
+            return None
+
+        if config is None:
             _LOGGER.warning(
                 "Invalid life_stage for %s, cannot calculate energy need.",
                 self.config.animal_type,
             )
-            return
+            return None
 
-        ideal_weight = data.get("ideal_weight")
-        if ideal_weight is None:
-            _LOGGER.warning("Ideal weight is None, cannot calculate energy need.")
-            return
+        return calculate_energy_need(config, ideal_weight)
 
-        config = EnergyConfig(
-            animal_type=self.config.animal_type,
-            breed=self.config.breed,
-            life_stage=life_stage,
-            activity=self.config.activity,
-            reproductive=self.config.reproductive,
-            morphology=self.config.morphology,
-            environment=self.config.environment,
-            appetite=self.config.appetite,
-            temperament=self.config.temperament,
-        )
-
-        energy_need = calculate_energy_need(config, ideal_weight)
+    def _compute_last_time(self, last_time_str: str | None) -> datetime | None:
+        if not last_time_str:
+            return None
 
-        data["energy_need"] = energy_need
+        try:
+            dt = parse_datetime(last_time_str)
+            if dt:
+                self._last_time = dt.astimezone(dt_util.DEFAULT_TIME_ZONE)
+                return self._last_time
+            _LOGGER.warning("Conversion error for 'last_time': %s", last_time_str)
+        except ValueError as e:
+            _LOGGER.warning("Invalid format for 'last_time': %s - %s", last_time_str, e)
+        return None
@@ -0,0 +1,19 @@
+"""Calculation core of the BodyPetScale integration.
+
+Data tables, factor tables, life stages and the energy formulas, scalar,
+batch and over a grid. Nothing in this package imports Home Assistant or the
+integration, so tools can load it on its own. Importing it through the
+integration runs the integration __init__, and putting the integration
+directory on sys.path would make it a top-level "core" package, so tools load
+it under a name of their own, as scripts/calculate.py does:
+
+    spec = importlib.util.spec_from_file_location(
+        "bodypetscale_core", core_dir / "__init__.py",
+        submodule_search_locations=[str(core_dir)],
+    )
+    sys.modules[spec.name] = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(sys.modules[spec.name])
+    from bodypetscale_core.calculations import calculate_energy_need
+
+Only the batch and grid modules need numpy, and only when imported.
+"""
@@ -0,0 +1,249 @@
+"""Batch calculation module.
+
+Vectorized counterparts of `calculations.calculate_ideal_weight` and
+`calculations.calculate_energy_need` for computing a whole roster of pets in
+one pass. Every text column is passed as integer codes (see `encode_column`),
+a code of -1 standing for a missing or unknown value. Where the scalar
+functions return None, the batch result holds NaN.
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+import numpy.typing as npt
+
+from . import factors
+from .data_tables import MORPHOLOGY_PERCENTAGES
+
+ANIMAL_DOG = 0
+ANIMAL_CAT = 1
+
+ANIMAL_TYPE_KEYS: tuple[str, ...] = ("dog", "cat")
+ACTIVITY_KEYS = factors.get_table(factors.ACTIVITY).keys
+APPETITE_KEYS = factors.get_table(factors.APPETITE).keys
+BREED_KEYS = factors.get_table(factors.BREED).keys
+ENVIRONMENT_KEYS = factors.get_table(factors.ENVIRONMENT).keys
+LIFE_STAGE_KEYS: tuple[str, ...] = tuple(
+    dict.fromkeys(
+        [
+            *factors.get_life_stage_table("cat").keys,
+            *factors.get_life_stage_table("dog").keys,
+        ]
+    )
+)
+MORPHOLOGY_KEYS = factors.get_table(factors.MORPHOLOGY).keys
+REPRODUCTIVE_KEYS = factors.get_table(factors.REPRODUCTIVE).keys
+TEMPERAMENT_KEYS = factors.get_table(factors.TEMPERAMENT).keys
+
+FloatArray = npt.NDArray[np.float64]
+CodeArray = npt.NDArray[np.intp]
+
+
+def _factor_vector(
+    table: factors.FactorTable, keys: tuple[str, ...] | None = None
+) -> FloatArray:
+    """Return a read-only factor vector aligned on keys, NaN where undefined."""
+    vector = np.array(
+        [
+            table.factors[table.codes[key]] if key in table.codes else np.nan
+            for key in (table.keys if keys is None else keys)
+        ],
+        dtype=np.float64,
+    )
+    vector.flags.writeable = False
+    return vector
+
+
+def _morphology_percentages() -> FloatArray:
+    """Return a read-only (morphology, animal type) percentage matrix."""
+    matrix = np.full((len(MORPHOLOGY_KEYS), len(ANIMAL_TYPE_KEYS)), np.nan)
+    for row, key in enumerate(MORPHOLOGY_KEYS):
+        percentages = MORPHOLOGY_PERCENTAGES.get(int(key.split("_")[0]), {})
+        for col, animal_type in enumerate(ANIMAL_TYPE_KEYS):
+            matrix[row, col] = percentages.get(animal_type, np.nan)
+    matrix.flags.writeable = False
+    return matrix
+
+
+_MORPHOLOGY_PERCENTAGES = _morphology_percentages()
+
+
+@dataclass(frozen=True)
+class _FactorVectors:
+    """Factor vectors of every table, indexed by code."""
+
+    activity: FloatArray
+    appetite: FloatArray
+    breed: FloatArray
+    cat_life_stage: FloatArray
+    dog_life_stage: FloatArray
+    environment: FloatArray
+    morphology: FloatArray
+    reproductive: FloatArray
+    temperament: FloatArray
+
+
+@lru_cache(maxsize=1)
+def _factor_vectors(overrides_version: int) -> _FactorVectors:
+    """Return the factor vectors, rebuilt whenever the overrides change."""
+    return _FactorVectors(
+        activity=_factor_vector(factors.get_table(factors.ACTIVITY)),
+        appetite=_factor_vector(factors.get_table(factors.APPETITE)),
+        breed=_factor_vector(factors.get_table(factors.BREED)),
+        cat_life_stage=_factor_vector(
+            factors.get_life_stage_table("cat"), LIFE_STAGE_KEYS
+        ),
+        dog_life_stage=_factor_vector(
+            factors.get_life_stage_table("dog"), LIFE_STAGE_KEYS
+        ),
+        environment=_factor_vector(factors.get_table(factors.ENVIRONMENT)),
+        morphology=_factor_vector(factors.get_table(factors.MORPHOLOGY)),
+        reproductive=_factor_vector(factors.get_table(factors.REPRODUCTIVE)),
+        temperament=_factor_vector(factors.get_table(factors.TEMPERAMENT)),
+    )
+
+
+@dataclass
+class BatchResult:
+    """Ideal weights and energy needs of a roster, NaN where not computable."""
+
+    ideal_weight: FloatArray
+    energy_need: FloatArray
+
+
+def encode_column(keys: tuple[str, ...], values: Iterable[str | None]) -> CodeArray:
+    """Encode text values as integer codes into keys, -1 if missing or unknown."""
+    index = {key: code for code, key in enumerate(keys)}
+    return np.fromiter(
+        (index.get(value, -1) if value else -1 for value in values), dtype=np.intp
+    )
+
+
+def _take(vector: FloatArray, codes: CodeArray) -> FloatArray:
+    """Look up codes in a factor vector, NaN for out of range codes."""
+    valid = (codes >= 0) & (codes < len(vector))
+    return np.where(valid, vector[np.where(valid, codes, 0)], np.nan)
+
+
+def _round_ideal_weight(values: FloatArray) -> FloatArray:
+    """Round to 2 decimals exactly like the builtin round used by the scalar path.
+
+    np.round scales by 100 before rounding, which does not always agree with
+    the correctly rounded builtin, so this single step stays in Python.
+    """
+    return np.fromiter(
+        (round(value, 2) for value in values.tolist()),
+        dtype=np.float64,
+        count=len(values),
+    )
+
+
+def calculate_ideal_weights(
+    weights: npt.ArrayLike, morphologies: npt.ArrayLike, animal_types: npt.ArrayLike
+) -> FloatArray:
+    """Calculate ideal weights for a roster, like `calculate_ideal_weight`."""
+    weight = np.asarray(weights, dtype=np.float64)
+    morphology = np.asarray(morphologies, dtype=np.intp)
+    animal_type = np.asarray(animal_types, dtype=np.intp)
+
+    valid = (
+        (morphology >= 0)
+        & (morphology < len(MORPHOLOGY_KEYS))
+        & (animal_type >= 0)
+        & (animal_type < len(ANIMAL_TYPE_KEYS))
+    )
+    percentage = np.where(
+        valid,
+        _MORPHOLOGY_PERCENTAGES[
+            np.where(valid, morphology, 0), np.where(valid, animal_type, 0)
+        ],
+        np.nan,
+    )
+    return _round_ideal_weight(weight * percentage)
+
+
+def calculate_energy_needs(
+    ideal_weights: npt.ArrayLike,
+    *,
+    animal_types: npt.ArrayLike,
+    breeds: npt.ArrayLike,
+    life_stages: npt.ArrayLike,
+    activities: npt.ArrayLike,
+    reproductives: npt.ArrayLike,
+    morphologies: npt.ArrayLike,
+    environments: npt.ArrayLike,
+    appetites: npt.ArrayLike,
+    temperaments: npt.ArrayLike,
+) -> FloatArray:
+    """Calculate energy needs for a roster, like `calculate_energy_need`."""
+    ideal_weight = np.asarray(ideal_weights, dtype=np.float64)
+    animal_type = np.asarray(animal_types, dtype=np.intp)
+    life_stage = np.asarray(life_stages, dtype=np.intp)
+    is_cat = animal_type == ANIMAL_CAT
+    is_dog = animal_type == ANIMAL_DOG
+    vectors = _factor_vectors(factors.overrides_version())
+
+    life_stage_factor = np.where(
+        is_cat,
+        _take(vectors.cat_life_stage, life_stage),
+        np.where(is_dog, _take(vectors.dog_life_stage, life_stage), np.nan),
+    )
+    species_factor = np.where(
+        is_cat,
+        _take(vectors.temperament, np.asarray(temperaments, dtype=np.intp)),
+        _take(vectors.appetite, np.asarray(appetites, dtype=np.intp)),
+    )
+    # Same multiplication order as get_common_energy_factor, so the floating
+    # point result is bit-identical.
+    total_factor = (
+        _take(vectors.breed, np.asarray(breeds, dtype=np.intp))
+        * life_stage_factor
+        * _take(vectors.activity, np.asarray(activities, dtype=np.intp))
+        * _take(vectors.reproductive, np.asarray(reproductives, dtype=np.intp))
+        * _take(vectors.morphology, np.asarray(morphologies, dtype=np.intp))
+        * _take(vectors.environment, np.asarray(environments, dtype=np.intp))
+        * species_factor
+    )
+
+    with np.errstate(invalid="ignore"):
+        cat_energy = total_factor * (100 * (ideal_weight**0.667))
+        dog_base = np.where(
+            ideal_weight < 21,
+            (ideal_weight**0.75) * 120,
+            (ideal_weight**0.667) * 156,
+        )
+        dog_energy = dog_base * total_factor
+
+    return np.rint(np.where(is_cat, cat_energy, dog_energy))
+
+
+def calculate_batch(
+    weights: npt.ArrayLike,
+    *,
+    animal_types: npt.ArrayLike,
+    breeds: npt.ArrayLike,
+    life_stages: npt.ArrayLike,
+    activities: npt.ArrayLike,
+    reproductives: npt.ArrayLike,
+    morphologies: npt.ArrayLike,
+    environments: npt.ArrayLike,
+    appetites: npt.ArrayLike,
+    temperaments: npt.ArrayLike,
+) -> BatchResult:
+    """Calculate ideal weights then energy needs for a whole roster."""
+    ideal_weight = calculate_ideal_weights(weights, morphologies, animal_types)
+    energy_need = calculate_energy_needs(
+        ideal_weight,
+        animal_types=animal_types,
+        breeds=breeds,
+        life_stages=life_stages,
+        activities=activities,
+        reproductives=reproductives,
+        morphologies=morphologies,
+        environments=environments,
+        appetites=appetites,
+        temperaments=temperaments,
+    )
+    return BatchResult(ideal_weight=ideal_weight, energy_need=energy_need)
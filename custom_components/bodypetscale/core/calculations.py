@@ -0,0 +1,268 @@
+"""Pet calculation module.
+
+Ideal weight, age, life stage and energy need formulas.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from functools import _CacheInfo, lru_cache
+
+from .data_tables import MORPHOLOGY_PERCENTAGES, PUPPY_STAGES
+from .factors import (
+    ACTIVITY,
+    APPETITE,
+    BREED,
+    ENVIRONMENT,
+    MORPHOLOGY,
+    REPRODUCTIVE,
+    TEMPERAMENT,
+    get_life_stage_table,
+    get_table,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class EnergyConfig:
+    """Subset of config used to calculate energy needs."""
+
+    animal_type: str
+    breed: str
+    life_stage: str
+    activity: str
+    reproductive: str
+    morphology: str
+    environment: str
+    appetite: str | None = None
+    temperament: str | None = None
+
+
+def calculate_ideal_weight(
+    weight: float | None, morphology: str | None, animal_type: str | None
+) -> float | None:
+    """Calculate ideal weight based on morphology and animal type."""
+    if weight is None or not morphology or not animal_type:
+        return None
+
+    try:
+        morph_index = int(morphology.split("_")[0])
+    except (ValueError, IndexError):
+        _LOGGER.warning("Unable to extract morphology index from %s", morphology)
+        return None
+
+    if morph_index not in MORPHOLOGY_PERCENTAGES:
+        _LOGGER.warning("Unknown morphology index: %s", morph_index)
+        return None
+
+    try:
+        percentage = MORPHOLOGY_PERCENTAGES[morph_index][animal_type]
+        return round(weight * percentage, 2)
+    except KeyError:
+        _LOGGER.warning("Unknown or missing animal type: %s", animal_type)
+    except TypeError as e:
+        _LOGGER.error("Type error in ideal weight calculation: %s", e)
+    return None
+
+
+def get_age_in_months(date: str) -> int:
+    """Get current age in months from birthdate."""
+    born = datetime.strptime(date, "%Y-%m-%d")
+    today = datetime.today()
+
+    months = (today.year - born.year) * 12 + today.month - born.month
+    if today.day < born.day:
+        months -= 1
+
+    return months
+
+
+def get_age_string(date: str) -> str:
+    """Return a readable age string from birthdate."""
+    total_months = get_age_in_months(date)
+    years = total_months // 12
+    months = total_months % 12
+
+    year_label = "year" if years == 1 else "years"
+    month_label = "month" if months == 1 else "months"
+
+    if years > 0 and months > 0:
+        return f"{years} {year_label} and {months} {month_label}"
+    if years > 0:
+        return f"{years} {year_label}"
+    return f"{months} {month_label}"
+
+
+def get_cat_life_stage(age_months: int) -> str:
+    """Return cat life stage for an age in months."""
+    if 2 <= age_months < 4:
+        return "kitten_2_4"
+    if 4 <= age_months < 6:
+        return "kitten_4_6"
+    if 6 <= age_months < 8:
+        return "kitten_6_8"
+    if 8 <= age_months < 12:
+        return "young_adult_8_12"
+    if 12 <= age_months < 84:
+        return "adult"
+    return "senior"
+
+
+def get_dog_life_stage(age_months: int, weight: float) -> str:
+    """Return dog life stage for an age in months and adult weight."""
+    if age_months >= 96:
+        return "senior"
+
+    for (weight_min, weight_max), (age_min, age_max), stage in PUPPY_STAGES:
+        if weight_min <= weight < weight_max and age_min <= age_months <= age_max:
+            return stage
+
+    return "adult"
+
+
+def get_cat_age_stage(date: str) -> str:
+    """Return cat life stage based on age in months."""
+    return get_cat_life_stage(get_age_in_months(date))
+
+
+def get_dog_age_stage(date: str, weight: float) -> str:
+    """Return dog life stage based on age in months and adult weight."""
+    return get_dog_life_stage(get_age_in_months(date), weight)
+
+
+ENERGY_FACTOR_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=ENERGY_FACTOR_CACHE_SIZE)
+def _total_energy_factor(
+    animal_type: str,
+    breed: str,
+    life_stage: str,
+    activity: str,
+    reproductive: str,
+    morphology: str,
+    environment: str,
+    species_factor_key: str | None,
+) -> float:
+    """Return the combined energy factor of a profile, memoized.
+
+    A pet's profile rarely changes between refreshes, only morphology and life
+    stage do, so the cache stays small and nearly always hits. Failures raise
+    and are therefore never cached.
+    """
+    try:
+        breed_factor = get_table(BREED).factor(breed)
+        life_stage_factor = get_life_stage_table(animal_type).factor(life_stage)
+        activity_factor = get_table(ACTIVITY).factor(activity)
+        reproductive_factor = get_table(REPRODUCTIVE).factor(reproductive)
+        morphology_factor = get_table(MORPHOLOGY).factor(morphology)
+        environment_factor = get_table(ENVIRONMENT).factor(environment)
+
+        if animal_type == "cat":
+            if not species_factor_key:
+                raise ValueError("Temperament is required for cats.")
+            species_factor = get_table(TEMPERAMENT).factor(species_factor_key)
+        else:
+            if not species_factor_key:
+                raise ValueError("Appetite is required for dogs.")
+            species_factor = get_table(APPETITE).factor(species_factor_key)
+
+    except KeyError as e:
+        raise ValueError(f"Invalid factor key: {e.args[0]}") from e
+
+    return (
+        breed_factor
+        * life_stage_factor
+        * activity_factor
+        * reproductive_factor
+        * morphology_factor
+        * environment_factor
+        * species_factor
+    )
+
+
+def get_common_energy_factor(config: EnergyConfig) -> float:
+    """Calculate the common energy factor for cats or dogs."""
+
+    if config.animal_type not in ("cat", "dog"):
+        raise ValueError(
+            f"Invalid animal_type '{config.animal_type}' (must be 'cat' or 'dog')."
+        )
+
+    return _total_energy_factor(
+        config.animal_type,
+        config.breed,
+        config.life_stage,
+        config.activity,
+        config.reproductive,
+        config.morphology,
+        config.environment,
+        config.temperament if config.animal_type == "cat" else config.appetite,
+    )
+
+
+def energy_factor_cache_info() -> _CacheInfo:
+    """Return hit, miss and size statistics of the energy factor cache."""
+    return _total_energy_factor.cache_info()
+
+
+def clear_energy_factor_cache() -> None:
+    """Evict every entry of the energy factor cache."""
+    _total_energy_factor.cache_clear()
+
+
+def calculate_energy_need(
+    config: EnergyConfig,
+    ideal_weight: float,
+) -> int | None:
+    """Calculate energy need for a pet based on multiple factors."""
+
+    if config.animal_type == "cat":
+        required = [
+            config.activity,
+            config.breed,
+            config.life_stage,
+            config.environment,
+            config.reproductive,
+            config.morphology,
+            config.temperament,
+        ]
+    elif config.animal_type == "dog":
+        required = [
+            config.activity,
+            config.breed,
+            config.life_stage,
+            config.environment,
+            config.reproductive,
+            config.morphology,
+            config.appetite,
+        ]
+    else:
+        _LOGGER.error("Invalid animal type: %s", config.animal_type)
+        return None
+
+    if not all(required):
+        _LOGGER.error(
+            "One or more required configuration values are missing for %s.",
+            config.animal_type,
+        )
+        return None
+
+    try:
+        total_factor = get_common_energy_factor(config)
+    except ValueError as e:
+        _LOGGER.error("Error calculating energy factor: %s", e)
+        return None
+
+    if config.animal_type == "cat":
+        base_energy = 100 * (ideal_weight**0.667)
+        energy_need = round(total_factor * base_energy, 0)
+    else:
+        if ideal_weight < 21:
+            base_energy = (ideal_weight**0.75) * 120
+        else:
+            base_energy = (ideal_weight**0.667) * 156
+        energy_need = base_energy * total_factor
+
+    return int(round(energy_need))
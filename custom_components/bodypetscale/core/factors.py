@@ -0,0 +1,130 @@
+"""Compiled factor tables module.
+
+The string keyed tables of `data_tables` are compiled into frozen, integer
+indexed tables, so callers can resolve a key to a code once and then work with
+plain tuple indexing. Tables are compiled on first use and cached, so only the
+ones a configured pet actually needs are ever built.
+
+User overrides (see `factor_overrides`) are merged over the built-in factors.
+They may only replace factors of known keys, so the codes of a table never
+change, only its factors.
+"""
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from functools import cache
+from types import MappingProxyType
+
+from . import data_tables
+
+ACTIVITY = "activity"
+APPETITE = "appetite"
+BREED = "breed"
+ENVIRONMENT = "environment"
+MORPHOLOGY = "morphology"
+REPRODUCTIVE = "reproductive"
+TEMPERAMENT = "temperament"
+
+_SOURCES: Mapping[str, str] = MappingProxyType(
+    {
+        ACTIVITY: "ACTIVITY_FACTORS",
+        APPETITE: "APPETITE_FACTORS",
+        BREED: "BREED_FACTORS",
+        ENVIRONMENT: "ENVIRONMENT_FACTORS",
+        MORPHOLOGY: "MORPHOLOGY_FACTORS",
+        REPRODUCTIVE: "REPRODUCTIVE_FACTORS",
+        TEMPERAMENT: "TEMPERAMENT_FACTORS",
+    }
+)
+_LIFE_STAGE_SOURCES: Mapping[str, str] = MappingProxyType(
+    {"cat": "CAT_LIFE_STAGE_FACTORS", "dog": "DOG_LIFE_STAGE_FACTORS"}
+)
+
+
+def life_stage_table_name(animal_type: str) -> str:
+    """Return the name of the life stage table of a species."""
+    return f"{animal_type}_life_stage"
+
+
+@dataclass
+class _Overrides:
+    """Factor overrides in effect, and how many times they were replaced."""
+
+    tables: Mapping[str, Mapping[str, float]] = field(default_factory=dict)
+    version: int = 0
+
+
+_overrides = _Overrides()
+
+
+@dataclass(frozen=True)
+class FactorTable:
+    """Factor table compiled to integer codes."""
+
+    keys: tuple[str, ...]
+    factors: tuple[float, ...]
+    codes: Mapping[str, int]
+
+    def code(self, key: str) -> int:
+        """Return the code of a key, raise KeyError if unknown."""
+        return self.codes[key]
+
+    def factor(self, key: str) -> float:
+        """Return the factor of a key, raise KeyError if unknown."""
+        return self.factors[self.codes[key]]
+
+
+def compile_table(factors: Mapping[str, float]) -> FactorTable:
+    """Compile a string keyed factor table into a FactorTable."""
+    keys = tuple(factors)
+    return FactorTable(
+        keys=keys,
+        factors=tuple(float(factors[key]) for key in keys),
+        codes=MappingProxyType({key: code for code, key in enumerate(keys)}),
+    )
+
+
+def builtin_tables() -> dict[str, Mapping[str, float]]:
+    """Return every built-in factor table by name, life stage tables included."""
+    tables = {name: getattr(data_tables, source) for name, source in _SOURCES.items()}
+    for animal_type, source in _LIFE_STAGE_SOURCES.items():
+        tables[life_stage_table_name(animal_type)] = getattr(data_tables, source)
+    return tables
+
+
+def _compile_with_overrides(name: str, factors: Mapping[str, float]) -> FactorTable:
+    """Compile a built-in table with its overrides merged in."""
+    return compile_table({**factors, **_overrides.tables.get(name, {})})
+
+
+@cache
+def get_table(name: str) -> FactorTable:
+    """Return the compiled factor table name, raise KeyError if unknown."""
+    return _compile_with_overrides(name, getattr(data_tables, _SOURCES[name]))
+
+
+@cache
+def get_life_stage_table(animal_type: str) -> FactorTable:
+    """Return the compiled life stage table of a species, KeyError if unknown."""
+    return _compile_with_overrides(
+        life_stage_table_name(animal_type),
+        getattr(data_tables, _LIFE_STAGE_SOURCES[animal_type]),
+    )
+
+
+def set_overrides(tables: Mapping[str, Mapping[str, float]]) -> None:
+    """Replace the factor overrides, tables being recompiled on next use."""
+    _overrides.tables = tables
+    _overrides.version += 1
+    get_table.cache_clear()
+    get_life_stage_table.cache_clear()
+
+
+def current_overrides() -> Mapping[str, Mapping[str, float]]:
+    """Return the factor overrides in effect."""
+    return _overrides.tables
+
+
+def overrides_version() -> int:
+    """Return a number changing every time the overrides are replaced."""
+    return _overrides.version
@@ -0,0 +1,71 @@
+"""Life stage schedule module.
+
+A life stage only depends on the age in months through a few thresholds, so
+the dates at which a pet crosses them can be computed once from its birthday.
+Between two such dates the age can be represented by the last threshold
+crossed without changing the resulting stage.
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date, datetime
+
+from .data_tables import PUPPY_STAGES
+
+CAT_STAGE_MONTHS: tuple[int, ...] = (2, 4, 6, 8, 12, 84)
+DOG_STAGE_MONTHS: tuple[int, ...] = tuple(
+    sorted(
+        {age_min for _, (age_min, _), _ in PUPPY_STAGES}
+        | {age_max + 1 for _, (_, age_max), _ in PUPPY_STAGES}
+        | {96}
+    )
+)
+
+STAGE_MONTHS: dict[str, tuple[int, ...]] = {
+    "cat": CAT_STAGE_MONTHS,
+    "dog": DOG_STAGE_MONTHS,
+}
+
+
+def add_months(born: date, months: int) -> date:
+    """Return the first day on which `get_age_in_months` reaches months.
+
+    When the birthday does not exist in the target month (31st, 29th of
+    February), the age is reached on the first day of the following month.
+    """
+    year, month = divmod(born.month - 1 + months, 12)
+    try:
+        return born.replace(year=born.year + year, month=month + 1)
+    except ValueError:
+        year, month = divmod(born.month + months, 12)
+        return date(born.year + year, month + 1, 1)
+
+
+@dataclass(frozen=True)
+class LifeStageSchedule:
+    """Dates at which a pet crosses the age thresholds of its life stages."""
+
+    months: tuple[int, ...]
+    boundaries: tuple[date, ...]
+
+    @classmethod
+    def from_birthday(cls, animal_type: str, birthday: str) -> "LifeStageSchedule":
+        """Build the schedule of a pet, raise ValueError if it has none."""
+        if animal_type not in STAGE_MONTHS:
+            raise ValueError(f"Unknown animal type: {animal_type}")
+        born = datetime.strptime(birthday, "%Y-%m-%d").date()
+        months = STAGE_MONTHS[animal_type]
+        return cls(
+            months=months,
+            boundaries=tuple(add_months(born, month) for month in months),
+        )
+
+    def age_months_at(self, day: date) -> int:
+        """Return the last age threshold crossed on day, 0 if none."""
+        index = bisect_right(self.boundaries, day)
+        return self.months[index - 1] if index else 0
+
+    def next_boundary(self, day: date) -> date | None:
+        """Return the first threshold date after day, None if all are past."""
+        index = bisect_right(self.boundaries, day)
+        return self.boundaries[index] if index < len(self.boundaries) else None
@@ -0,0 +1,60 @@
+"""Diagnostics support for BodyPetScale."""
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import BodyPetScaleCoordinator
+from .core.calculations import energy_factor_cache_info
+from .dispatcher import async_get_dispatcher
+from .factor_overrides import DATA_FACTOR_OVERRIDES, FactorOverrides
+from .shared_scale import async_get_shared_scale_router
+
+TO_REDACT = {CONF_NAME}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: BodyPetScaleCoordinator = hass.data[DOMAIN][entry.entry_id]
+    outlier_filter = coordinator.outlier_filter
+    overrides: FactorOverrides | None = hass.data.get(DATA_FACTOR_OVERRIDES)
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": async_redact_data(entry.options, TO_REDACT),
+        },
+        "config": async_redact_data(asdict(coordinator.config), TO_REDACT),
+        "refresh": {
+            **coordinator.refresh_stats.as_dict(),
+            "requests": coordinator.refresh_requests,
+            "merged_requests": coordinator.merged_refresh_requests,
+            "last_changed_outputs": sorted(coordinator.changed_outputs),
+        },
+        "skipped_state_writes": coordinator.skipped_writes,
+        "outlier_filter": {
+            "window": outlier_filter.window,
+            "accepted": outlier_filter.accepted,
+            "rejected": outlier_filter.rejected,
+        },
+        "history_samples": len(coordinator.history),
+        "energy_factor_cache": energy_factor_cache_info()._asdict(),
+        "factor_overrides": (
+            {
+                "hash": overrides.content_hash,
+                "tables": overrides.tables,
+            }
+            if overrides
+            else None
+        ),
+        "dispatcher_entities": len(async_get_dispatcher(hass).entity_ids),
+        "shared_scales": len(async_get_shared_scale_router(hass).entity_ids),
+        "data": coordinator.data,
+    }
@@ -0,0 +1,100 @@
+"""Shared state change dispatcher for the BodyPetScale integration."""
+
+import logging
+
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+)
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import DOMAIN
+from .coordinator import BodyPetScaleCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_DISPATCHER = f"{DOMAIN}_dispatcher"
+
+
+class StateChangeDispatcher:
+    """Fan out state changes of monitored sensors to the coordinators using them.
+
+    Every monitored entity is subscribed once, whatever the number of pets
+    reading it, and an event is routed with a single index lookup.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._coordinators: dict[str, set[BodyPetScaleCoordinator]] = {}
+        self._entity_ids: dict[BodyPetScaleCoordinator, tuple[str, ...]] = {}
+        self._unsubscribers: dict[str, CALLBACK_TYPE] = {}
+
+    @property
+    def entity_ids(self) -> set[str]:
+        """Return the entities currently subscribed to."""
+        return set(self._unsubscribers)
+
+    @callback
+    def async_add(
+        self, coordinator: BodyPetScaleCoordinator, entity_ids: list[str]
+    ) -> CALLBACK_TYPE:
+        """Route state changes of entity_ids to coordinator.
+
+        Return a callback stopping the routing, to be run when the config entry
+        of the coordinator unloads.
+        """
+        self.async_remove(coordinator)
+        self._entity_ids[coordinator] = tuple(entity_ids)
+
+        for entity_id in entity_ids:
+            coordinators = self._coordinators.setdefault(entity_id, set())
+            coordinators.add(coordinator)
+            if entity_id not in self._unsubscribers:
+                self._unsubscribers[entity_id] = async_track_state_change_event(
+                    self.hass, entity_id, self._async_state_changed_listener
+                )
+
+        @callback
+        def _async_remove() -> None:
+            self.async_remove(coordinator)
+
+        return _async_remove
+
+    @callback
+    def async_remove(self, coordinator: BodyPetScaleCoordinator) -> None:
+        """Stop routing state changes to coordinator."""
+        for entity_id in self._entity_ids.pop(coordinator, ()):
+            coordinators = self._coordinators.get(entity_id)
+            if coordinators is None:
+                continue
+            coordinators.discard(coordinator)
+            if not coordinators:
+                del self._coordinators[entity_id]
+                self._unsubscribers.pop(entity_id)()
+
+    @callback
+    def _async_state_changed_listener(
+        self, event: Event[EventStateChangedData]
+    ) -> None:
+        """Refresh every coordinator monitoring the changed sensor."""
+        entity_id = event.data["entity_id"]
+
+        for coordinator in self._coordinators.get(entity_id, ()):
+            _LOGGER.info(
+                "Monitored sensor %s changed, updating %s",
+                entity_id,
+                coordinator.config.name,
+            )
+            coordinator.async_schedule_refresh()
+
+
+@callback
+def async_get_dispatcher(hass: HomeAssistant) -> StateChangeDispatcher:
+    """Return the dispatcher shared by all config entries."""
+    dispatcher: StateChangeDispatcher | None = hass.data.get(DATA_DISPATCHER)
+    if dispatcher is None:
+        dispatcher = hass.data[DATA_DISPATCHER] = StateChangeDispatcher(hass)
+    return dispatcher
@@ -0,0 +1,46 @@
+"""What-if energy need grid module.
+
+Sweeps the options of the integration over a grid computed by `core.grid`.
+"""
+
+from collections.abc import Sequence
+from typing import Any
+
+from .const import (
+    ACTIVITY_LEVELS,
+    ATTR_ENERGY_NEED,
+    LIVING_ENVIRONMENT_OPTIONS,
+    MORPHOLOGY_OPTIONS,
+    REPRODUCTIVE_STATUS,
+)
+from .core.grid import GridAxes, GridProfile, calculate_energy_grid, grid_to_list
+
+
+def get_grid_axes(
+    animal_type: str,
+    weights: Sequence[float],
+    activities: Sequence[str] | None = None,
+    environments: Sequence[str] | None = None,
+    morphologies: Sequence[str] | None = None,
+    reproductives: Sequence[str] | None = None,
+) -> GridAxes:
+    """Return axes sweeping every option of animal_type unless restricted."""
+    return GridAxes(
+        weights=tuple(weights),
+        activities=tuple(activities or ACTIVITY_LEVELS.get(animal_type, [])),
+        environments=tuple(
+            environments or LIVING_ENVIRONMENT_OPTIONS.get(animal_type, [])
+        ),
+        morphologies=tuple(morphologies or MORPHOLOGY_OPTIONS),
+        reproductives=tuple(reproductives or REPRODUCTIVE_STATUS),
+    )
+
+
+def energy_grid_response(profile: GridProfile, axes: GridAxes) -> dict[str, Any]:
+    """Return the energy grid of a profile as a service response.
+
+    Converting the grid to lists takes as long as computing it, both run in
+    the executor.
+    """
+    grid = calculate_energy_grid(profile, axes)
+    return {"axes": axes.as_dict(), ATTR_ENERGY_NEED: grid_to_list(grid)}
@@ -0,0 +1,199 @@
+"""Factor overrides for the BodyPetScale integration.
+
+Factors of the built-in tables can be overridden from a YAML or JSON file in
+the configuration directory, for example:
+
+    breed:
+      golden_retriever: 0.95
+    dog_life_stage:
+      adult: 1.05
+
+A file is validated once; the validated tables are stored along with the
+SHA-256 of the file content and of the built-in tables, so a restart with an
+unchanged file skips parsing and validation, until a release changes the
+built-in tables the file was validated against. The file is polled for changes and reloaded without
+reloading the config entries.
+"""
+
+import hashlib
+import json
+import logging
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.util.yaml import parse_yaml
+
+from .const import DOMAIN
+from .coordinator import BodyPetScaleCoordinator
+from .core.calculations import clear_energy_factor_cache
+from .core.factors import builtin_tables, set_overrides
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_FACTOR_OVERRIDES = f"{DOMAIN}_factor_overrides"
+FACTOR_OVERRIDE_FILES = ("bodypetscale_factors.yaml", "bodypetscale_factors.json")
+FACTOR_OVERRIDE_SCAN_INTERVAL = timedelta(seconds=30)
+STORAGE_VERSION = 1
+
+
+def _overrides_schema() -> vol.Schema:
+    """Return the schema of an override file, only accepting known keys."""
+    positive_factor = vol.All(vol.Coerce(float), vol.Range(min=0, min_included=False))
+    return vol.Schema(
+        {
+            vol.Optional(name): {
+                vol.In(list(table), msg=f"unknown {name} key"): positive_factor
+            }
+            for name, table in builtin_tables().items()
+        }
+    )
+
+
+@cache
+def builtin_tables_hash() -> str:
+    """Return the SHA-256 of the built-in tables the overrides are checked against."""
+    tables = json.dumps(builtin_tables(), sort_keys=True).encode("utf-8")
+    return hashlib.sha256(tables).hexdigest()
+
+
+def parse_overrides(path: Path, content: bytes) -> dict[str, dict[str, float]]:
+    """Parse and validate override file content, raise ValueError if invalid."""
+    try:
+        if path.suffix == ".json":
+            data = json.loads(content)
+        else:
+            data = parse_yaml(content.decode("utf-8"))
+        return _overrides_schema()(data or {})
+    except (HomeAssistantError, UnicodeDecodeError, ValueError, vol.Invalid) as err:
+        raise ValueError(f"Invalid factor overrides in {path.name}: {err}") from err
+
+
+class FactorOverrides:
+    """Load, cache and watch the factor override file."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.factor_overrides"
+        )
+        self._config_dir = Path(hass.config.config_dir)
+        self._signature: tuple[str, int, int] | None = None
+        self.content_hash: str | None = None
+        self.tables: Mapping[str, Mapping[str, float]] = {}
+
+    def _find_file(self) -> tuple[Path, tuple[str, int, int]] | None:
+        """Return the override file and its name, mtime and size, if any."""
+        for name in FACTOR_OVERRIDE_FILES:
+            path = self._config_dir / name
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            return path, (name, stat.st_mtime_ns, stat.st_size)
+        return None
+
+    def _read_file(self) -> tuple[Path, tuple[str, int, int], bytes] | None:
+        """Return the override file, its signature and its content, if any."""
+        if (found := self._find_file()) is None:
+            return None
+        path, signature = found
+        return path, signature, path.read_bytes()
+
+    async def async_load(self) -> None:
+        """Load the override file, reusing the stored tables if it is unchanged."""
+        try:
+            found = await self.hass.async_add_executor_job(self._read_file)
+        except OSError as err:
+            _LOGGER.error("Unable to read factor overrides: %s", err)
+            return
+        if found is None:
+            if self._signature is not None or self.tables:
+                _LOGGER.info("Factor overrides removed, using built-in factors")
+            self._signature = None
+            await self._async_apply(None, {}, save=False)
+            return
+
+        path, signature, content = found
+        self._signature = signature
+        content_hash = hashlib.sha256(content).hexdigest()
+        if content_hash == self.content_hash:
+            return
+
+        stored = await self._store.async_load()
+        if (
+            stored is not None
+            and stored.get("hash") == content_hash
+            and stored.get("builtin_hash") == builtin_tables_hash()
+        ):
+            await self._async_apply(content_hash, stored["tables"], save=False)
+            return
+
+        try:
+            tables = await self.hass.async_add_executor_job(
+                parse_overrides, path, content
+            )
+        except ValueError as err:
+            _LOGGER.error("%s, keeping the factors in use", err)
+            return
+        _LOGGER.info("Loaded factor overrides from %s", path.name)
+        await self._async_apply(content_hash, tables)
+
+    async def _async_apply(
+        self,
+        content_hash: str | None,
+        tables: Mapping[str, Mapping[str, float]],
+        save: bool = True,
+    ) -> None:
+        """Put tables in effect and refresh the pets if they changed."""
+        self.content_hash = content_hash
+        if save:
+            await self._store.async_save(
+                {
+                    "hash": content_hash,
+                    "builtin_hash": builtin_tables_hash(),
+                    "tables": tables,
+                }
+            )
+        if tables == self.tables:
+            return
+        self.tables = tables
+        set_overrides(tables)
+        clear_energy_factor_cache()
+        coordinator: BodyPetScaleCoordinator
+        for coordinator in self.hass.data.get(DOMAIN, {}).values():
+            coordinator.async_schedule_refresh()
+
+    async def _async_check(self, _now: datetime) -> None:
+        """Reload the override file if it was added, changed or removed."""
+        try:
+            found = await self.hass.async_add_executor_job(self._find_file)
+        except OSError:
+            found = None
+        if (found[1] if found else None) != self._signature:
+            await self.async_load()
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Start watching the override file, return a callback to stop."""
+        return async_track_time_interval(
+            self.hass,
+            self._async_check,
+            FACTOR_OVERRIDE_SCAN_INTERVAL,
+            name="BodyPetScale factor overrides",
+            cancel_on_shutdown=True,
+        )
+
+
+async def async_setup_factor_overrides(hass: HomeAssistant) -> None:
+    """Load the factor overrides and watch them for changes."""
+    overrides = hass.data[DATA_FACTOR_OVERRIDES] = FactorOverrides(hass)
+    await overrides.async_load()
+    overrides.async_start()
@@ -0,0 +1,70 @@
+"""Feeding plan module.
+
+Turns the energy needs of a roster into daily and per meal portions of the
+foods of a catalog. The grams per kcal of every food are computed once, so
+each pet only costs a multiplication per suitable food.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+DEFAULT_MEALS_PER_DAY = 2
+
+
+@dataclass(frozen=True)
+class Food:
+    """Food of the catalog, only for one animal type if set."""
+
+    name: str
+    kcal_per_kg: float
+    meals_per_day: int = DEFAULT_MEALS_PER_DAY
+    animal_type: str | None = None
+
+
+@dataclass(frozen=True)
+class Portion:
+    """Daily and per meal amount of a food covering an energy need."""
+
+    food: str
+    grams_per_day: float
+    meals_per_day: int
+    grams_per_meal: float
+
+
+def calculate_portions(
+    energy_needs: Sequence[float | None],
+    animal_types: Sequence[str | None],
+    foods: Sequence[Food],
+) -> list[list[Portion]]:
+    """Return the portions of every suitable food for each pet of a roster.
+
+    A pet without an energy need gets no portion.
+    """
+    grams_per_kcal = [1000 / food.kcal_per_kg for food in foods]
+    suitable: dict[str | None, list[int]] = {}
+    for animal_type in set(animal_types):
+        suitable[animal_type] = [
+            index
+            for index, food in enumerate(foods)
+            if food.animal_type is None or food.animal_type == animal_type
+        ]
+
+    plan: list[list[Portion]] = []
+    for energy_need, animal_type in zip(energy_needs, animal_types, strict=True):
+        if energy_need is None:
+            plan.append([])
+            continue
+        portions = []
+        for index in suitable[animal_type]:
+            food = foods[index]
+            grams = energy_need * grams_per_kcal[index]
+            portions.append(
+                Portion(
+                    food=food.name,
+                    grams_per_day=round(grams, 1),
+                    meals_per_day=food.meals_per_day,
+                    grams_per_meal=round(grams / food.meals_per_day, 1),
+                )
+            )
+        plan.append(portions)
+    return plan
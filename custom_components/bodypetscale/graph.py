@@ -0,0 +1,80 @@
+"""Dependency graph module."""
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class _Node:
+    """Computed node of a DependencyGraph."""
+
+    name: str
+    dependencies: tuple[str, ...]
+    function: Callable[..., Any]
+
+
+class DependencyGraph:
+    """Small dependency graph recomputing only the nodes whose inputs changed.
+
+    Nodes must be added after their dependencies, so registration order is a
+    valid topological order and recompute is a single pass.
+    """
+
+    def __init__(self) -> None:
+        self._nodes: dict[str, _Node] = {}
+        self._dependents: dict[str, list[str]] = {}
+        self._values: dict[str, Any] = {}
+        self._dirty: set[str] = set()
+
+    def add_input(self, name: str, value: Any = None) -> None:
+        """Add an input node holding value."""
+        self._dependents[name] = []
+        self._values[name] = value
+
+    def add_node(
+        self,
+        name: str,
+        dependencies: Iterable[str],
+        function: Callable[..., Any],
+    ) -> None:
+        """Add a node computed by function from the values of dependencies."""
+        node = _Node(name, tuple(dependencies), function)
+        for dependency in node.dependencies:
+            if dependency not in self._dependents:
+                raise ValueError(f"Unknown dependency '{dependency}' for '{name}'.")
+            self._dependents[dependency].append(name)
+        self._dependents[name] = []
+        self._nodes[name] = node
+        self._values[name] = None
+        self._dirty.add(name)
+
+    def set_input(self, name: str, value: Any) -> bool:
+        """Set an input value, return True and dirty its dependents if it changed."""
+        if name in self._values and self._values[name] == value:
+            return False
+        self._values[name] = value
+        self._dirty.update(self._dependents[name])
+        return True
+
+    def __getitem__(self, name: str) -> Any:
+        """Return the current value of a node."""
+        return self._values[name]
+
+    def recompute(self) -> set[str]:
+        """Recompute the dirty nodes and return the names of those that changed."""
+        changed: set[str] = set()
+        if not self._dirty:
+            return changed
+
+        for name, node in self._nodes.items():
+            if name not in self._dirty:
+                continue
+            value = node.function(*(self._values[dep] for dep in node.dependencies))
+            if value != self._values[name]:
+                self._values[name] = value
+                self._dirty.update(self._dependents[name])
+                changed.add(name)
+
+        self._dirty.clear()
+        return changed
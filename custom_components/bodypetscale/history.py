@@ -0,0 +1,108 @@
+"""Weight history for the BodyPetScale integration."""
+
+from array import array
+from collections.abc import Callable, Iterator
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+DEFAULT_HISTORY_CAPACITY = 512
+HISTORY_SAVE_DELAY = 60
+STORAGE_VERSION = 1
+
+
+class WeightHistory:
+    """Fixed capacity ring buffer of (timestamp, weight) samples.
+
+    Samples live in two preallocated arrays of doubles, so memory does not
+    grow past the capacity and appending overwrites the oldest sample in O(1).
+    """
+
+    def __init__(self, capacity: int = DEFAULT_HISTORY_CAPACITY) -> None:
+        if capacity < 1:
+            raise ValueError("History capacity must be at least 1.")
+        self.capacity = capacity
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._weights = array("d", bytes(8 * capacity))
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return self._size
+
+    def __iter__(self) -> Iterator[tuple[float, float]]:
+        """Iterate over the samples, oldest first."""
+        for offset in range(self._size):
+            index = (self._start + offset) % self.capacity
+            yield self._timestamps[index], self._weights[index]
+
+    def append(self, timestamp: float, weight: float) -> None:
+        """Append a sample, dropping the oldest one when full."""
+        if self._size < self.capacity:
+            index = (self._start + self._size) % self.capacity
+            self._size += 1
+        else:
+            index = self._start
+            self._start = (self._start + 1) % self.capacity
+        self._timestamps[index] = timestamp
+        self._weights[index] = weight
+
+    def latest(self) -> tuple[float, float] | None:
+        """Return the newest sample, None if empty."""
+        if not self._size:
+            return None
+        index = (self._start + self._size - 1) % self.capacity
+        return self._timestamps[index], self._weights[index]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the samples as a JSON serializable dict, oldest first."""
+        timestamps: list[float] = []
+        weights: list[float] = []
+        for timestamp, weight in self:
+            timestamps.append(timestamp)
+            weights.append(weight)
+        return {"timestamps": timestamps, "weights": weights}
+
+    @classmethod
+    def from_dict(
+        cls, data: dict[str, Any], capacity: int = DEFAULT_HISTORY_CAPACITY
+    ) -> "WeightHistory":
+        """Rebuild a history from as_dict output, keeping the newest samples."""
+        history = cls(capacity)
+        for timestamp, weight in zip(
+            data.get("timestamps", [])[-capacity:],
+            data.get("weights", [])[-capacity:],
+            strict=False,
+        ):
+            history.append(float(timestamp), float(weight))
+        return history
+
+
+class WeightHistoryStore:
+    """Persist the weight history of one pet with delayed, batched saves."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.history.{entry_id}"
+        )
+
+    async def async_load(self) -> dict[str, Any]:
+        """Load the stored data, empty if there is none."""
+        return await self._store.async_load() or {}
+
+    @callback
+    def async_schedule_save(self, data_func: Callable[[], dict[str, Any]]) -> None:
+        """Save the data once nothing new arrived for HISTORY_SAVE_DELAY."""
+        self._store.async_delay_save(data_func, HISTORY_SAVE_DELAY)
+
+    async def async_save(self, data: dict[str, Any]) -> None:
+        """Save the data now, superseding any delayed save."""
+        await self._store.async_save(data)
+
+    async def async_remove(self) -> None:
+        """Remove the stored data."""
+        await self._store.async_remove()
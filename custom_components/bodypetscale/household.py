@@ -0,0 +1,153 @@
+"""Household aggregates for the BodyPetScale integration."""
+
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import ATTR_ENERGY_NEED, ATTR_IDEAL, CONF_WEIGHT_SENSOR, DOMAIN
+from .coordinator import BodyPetScaleCoordinator
+from .util import get_pet_issue
+
+DATA_HOUSEHOLD = f"{DOMAIN}_household"
+
+
+@dataclass(frozen=True)
+class PetContribution:
+    """Share of a pet in the household aggregates."""
+
+    energy_need: float = 0.0
+    problem: bool = False
+    # Deviation from the ideal weight in percent, None if not computable.
+    deviation: float | None = None
+
+
+def get_pet_contribution(
+    data: dict[str, Any], has_last_time_sensor: bool
+) -> PetContribution:
+    """Return the contribution of a pet from its coordinator data."""
+    energy_need = data.get(ATTR_ENERGY_NEED)
+    weight = data.get(CONF_WEIGHT_SENSOR)
+    ideal_weight = data.get(ATTR_IDEAL)
+    deviation = None
+    if isinstance(weight, (int, float)) and isinstance(ideal_weight, (int, float)):
+        if ideal_weight > 0:
+            deviation = (weight - ideal_weight) / ideal_weight * 100
+    return PetContribution(
+        energy_need=energy_need if isinstance(energy_need, (int, float)) else 0.0,
+        problem=get_pet_issue(data, has_last_time_sensor) is not None,
+        deviation=deviation,
+    )
+
+
+class HouseholdAggregator:
+    """Maintain totals across every pet of the household.
+
+    Each coordinator update replaces the contribution of its pet by
+    subtracting the previous one and adding the new one, so an update costs
+    the same whatever the number of pets.
+    """
+
+    def __init__(self) -> None:
+        self._contributions: dict[str, PetContribution] = {}
+        self._listeners: list[CALLBACK_TYPE] = []
+        self._energy_need = 0.0
+        self._problems = 0
+        self._deviation_sum = 0.0
+        self._deviation_count = 0
+
+    @property
+    def pets(self) -> int:
+        """Return the number of pets aggregated."""
+        return len(self._contributions)
+
+    @property
+    def total_energy_need(self) -> int:
+        """Return the daily energy need of all pets, in kcal."""
+        return round(self._energy_need)
+
+    @property
+    def problem_pets(self) -> int:
+        """Return the number of pets having a problem."""
+        return self._problems
+
+    @property
+    def mean_weight_deviation(self) -> float | None:
+        """Return the mean deviation from the ideal weight, in percent."""
+        if not self._deviation_count:
+            return None
+        return round(self._deviation_sum / self._deviation_count, 1)
+
+    @callback
+    def async_add(
+        self, entry_id: str, coordinator: BodyPetScaleCoordinator
+    ) -> CALLBACK_TYPE:
+        """Aggregate the pet of coordinator and follow its updates.
+
+        Return a callback removing the pet, to be run when the config entry of
+        the coordinator unloads.
+        """
+        has_last_time_sensor = bool(coordinator.config.last_time_sensor)
+
+        @callback
+        def _async_coordinator_updated() -> None:
+            self._async_set(
+                entry_id,
+                get_pet_contribution(coordinator.data or {}, has_last_time_sensor),
+            )
+
+        _async_coordinator_updated()
+        unsub = coordinator.async_add_listener(_async_coordinator_updated)
+
+        @callback
+        def _async_remove() -> None:
+            unsub()
+            self._async_set(entry_id, None)
+
+        return _async_remove
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call update_callback whenever the aggregates change."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def _async_remove() -> None:
+            self._listeners.remove(update_callback)
+
+        return _async_remove
+
+    @callback
+    def _async_set(self, entry_id: str, contribution: PetContribution | None) -> None:
+        """Replace the contribution of a pet, None to remove it."""
+        previous = self._contributions.pop(entry_id, None)
+        if contribution is not None:
+            self._contributions[entry_id] = contribution
+        if previous == contribution:
+            return
+        if previous is not None:
+            self._apply(previous, -1)
+        if contribution is not None:
+            self._apply(contribution, 1)
+        if not self._contributions:
+            # Start over from exact zeros rather than accumulated rounding.
+            self._energy_need = self._deviation_sum = 0.0
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    def _apply(self, contribution: PetContribution, sign: int) -> None:
+        """Add a contribution to the aggregates, or subtract it."""
+        self._energy_need += sign * contribution.energy_need
+        self._problems += sign * contribution.problem
+        if contribution.deviation is not None:
+            self._deviation_sum += sign * contribution.deviation
+            self._deviation_count += sign
+
+
+@callback
+def async_get_household(hass: HomeAssistant) -> HouseholdAggregator:
+    """Return the household aggregator shared by all config entries."""
+    household: HouseholdAggregator | None = hass.data.get(DATA_HOUSEHOLD)
+    if household is None:
+        household = hass.data[DATA_HOUSEHOLD] = HouseholdAggregator()
+    return household
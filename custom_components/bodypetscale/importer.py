@@ -0,0 +1,253 @@
+"""Historical weigh-in import module.
+
+Weigh-ins are streamed from a CSV or JSONL file in fixed size chunks, their
+ideal weight and energy need computed per chunk with the batch functions, and
+the results folded into hourly statistics. Only one chunk and the hour being
+filled are held in memory, whatever the size of the file.
+"""
+
+import csv
+import json
+import math
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, tzinfo
+from pathlib import Path
+from typing import IO, Any
+
+from .const import ATTR_ENERGY_NEED, ATTR_IDEAL, CONF_WEIGHT_SENSOR
+from .core.batch import (
+    ACTIVITY_KEYS,
+    ANIMAL_TYPE_KEYS,
+    APPETITE_KEYS,
+    BREED_KEYS,
+    ENVIRONMENT_KEYS,
+    LIFE_STAGE_KEYS,
+    MORPHOLOGY_KEYS,
+    REPRODUCTIVE_KEYS,
+    TEMPERAMENT_KEYS,
+    calculate_batch,
+    encode_column,
+)
+from .core.calculations import get_cat_life_stage, get_dog_life_stage
+from .core.life_stage import LifeStageSchedule
+from .util import PetScaleConfig
+
+DEFAULT_CHUNK_SIZE = 5000
+IMPORT_METRICS: tuple[str, ...] = (CONF_WEIGHT_SENSOR, ATTR_IDEAL, ATTR_ENERGY_NEED)
+
+
+@dataclass
+class HourlyStatistic:
+    """Mean, min and max of a metric over one hour."""
+
+    start: datetime
+    total: float = 0.0
+    count: int = 0
+    min: float = math.inf
+    max: float = -math.inf
+
+    @property
+    def mean(self) -> float:
+        """Return the mean of the hour."""
+        return self.total / self.count
+
+    def add(self, value: float) -> None:
+        """Add a value to the hour."""
+        self.total += value
+        self.count += 1
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+
+@dataclass
+class ImportChunk:
+    """Completed hourly statistics of each metric, and the rows read."""
+
+    rows: int = 0
+    skipped: int = 0
+    statistics: dict[str, list[HourlyStatistic]] = field(
+        default_factory=lambda: {metric: [] for metric in IMPORT_METRICS}
+    )
+
+
+def _hour_start(timestamp: datetime) -> datetime:
+    """Return the start of the UTC hour of a timestamp."""
+    return timestamp.astimezone(UTC).replace(minute=0, second=0, microsecond=0)
+
+
+def _parse_timestamp(value: Any, time_zone: tzinfo) -> datetime:
+    """Parse an ISO 8601 or epoch timestamp, naive ones being in time_zone.
+
+    Epoch seconds may be a number or a numeric string, as read from a CSV file.
+    """
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, time_zone)
+    try:
+        parsed = datetime.fromisoformat(str(value).strip())
+    except ValueError:
+        return datetime.fromtimestamp(float(value), time_zone)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=time_zone)
+    return parsed
+
+
+class WeighInImporter:
+    """Read a weigh-in file chunk by chunk into hourly statistics.
+
+    Every method doing file I/O is blocking and meant to run in the executor.
+    Rows must be in chronological order, an hour being complete as soon as a
+    later hour shows up. A row from an earlier hour is skipped, as importing
+    it would overwrite the statistics of that hour.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        config: PetScaleConfig,
+        time_zone: tzinfo,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        self.path = path
+        self.config = config
+        self.time_zone = time_zone
+        self.chunk_size = chunk_size
+        self._schedule: LifeStageSchedule | None = None
+        try:
+            self._schedule = LifeStageSchedule.from_birthday(
+                config.animal_type, config.birthday
+            )
+        except ValueError:
+            pass
+        self._file: IO[str] | None = None
+        self._rows: Iterator[Any] | None = None
+        self._jsonl = path.suffix.lower() in (".jsonl", ".ndjson")
+        self._open_hours: dict[str, HourlyStatistic] = {}
+        self._hour: datetime | None = None
+
+    def open(self) -> None:
+        """Open the file, CSV unless its suffix is .jsonl or .ndjson."""
+        self._file = self.path.open(encoding="utf-8", newline="")
+        if self._jsonl:
+            # Lines are parsed with the rest of the row, so a malformed one is
+            # skipped like any other invalid row.
+            self._rows = (line for line in self._file if line.strip())
+        else:
+            self._rows = csv.DictReader(self._file)
+
+    def close(self) -> None:
+        """Close the file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._rows = None
+
+    def read_chunk(self) -> ImportChunk | None:
+        """Read and compute the next chunk, None once the file is exhausted."""
+        if self._rows is None:
+            raise RuntimeError("Importer is not open.")
+
+        chunk = ImportChunk()
+        timestamps: list[datetime] = []
+        weights: list[float] = []
+        while chunk.rows < self.chunk_size:
+            try:
+                row = next(self._rows)
+            except StopIteration:
+                break
+            except csv.Error:
+                chunk.rows += 1
+                chunk.skipped += 1
+                continue
+            chunk.rows += 1
+            try:
+                if self._jsonl:
+                    row = json.loads(row)
+                timestamp = _parse_timestamp(row["timestamp"], self.time_zone)
+                weight = float(row["weight"])
+            except (KeyError, TypeError, ValueError, OverflowError, OSError):
+                chunk.skipped += 1
+                continue
+            hour = _hour_start(timestamp)
+            if not math.isfinite(weight) or (
+                self._hour is not None and hour < self._hour
+            ):
+                chunk.skipped += 1
+                continue
+            self._hour = hour
+            timestamps.append(timestamp)
+            weights.append(weight)
+
+        if not chunk.rows:
+            return None
+        if weights:
+            self._aggregate(chunk, timestamps, weights)
+        return chunk
+
+    def flush(self) -> ImportChunk:
+        """Return the statistics of the hours still being filled."""
+        chunk = ImportChunk()
+        for metric, hour in self._open_hours.items():
+            chunk.statistics[metric].append(hour)
+        self._open_hours.clear()
+        return chunk
+
+    def _life_stages(
+        self, timestamps: list[datetime], weights: list[float]
+    ) -> list[str | None]:
+        """Return the life stage of the pet at each weigh-in."""
+        schedule = self._schedule
+        if schedule is None:
+            return [None] * len(timestamps)
+        if self.config.animal_type == "cat":
+            return [
+                get_cat_life_stage(schedule.age_months_at(timestamp.date()))
+                for timestamp in timestamps
+            ]
+        return [
+            get_dog_life_stage(schedule.age_months_at(timestamp.date()), weight)
+            for timestamp, weight in zip(timestamps, weights, strict=True)
+        ]
+
+    def _aggregate(
+        self, chunk: ImportChunk, timestamps: list[datetime], weights: list[float]
+    ) -> None:
+        """Compute the chunk and fold it into hourly statistics."""
+        config = self.config
+        count = len(weights)
+
+        def column(keys: tuple[str, ...], value: str | None) -> Any:
+            return encode_column(keys, [value] * count)
+
+        result = calculate_batch(
+            weights,
+            animal_types=column(ANIMAL_TYPE_KEYS, config.animal_type),
+            breeds=column(BREED_KEYS, config.breed),
+            life_stages=encode_column(
+                LIFE_STAGE_KEYS, self._life_stages(timestamps, weights)
+            ),
+            activities=column(ACTIVITY_KEYS, config.activity),
+            reproductives=column(REPRODUCTIVE_KEYS, config.reproductive),
+            morphologies=column(MORPHOLOGY_KEYS, config.morphology),
+            environments=column(ENVIRONMENT_KEYS, config.environment),
+            appetites=column(APPETITE_KEYS, config.appetite),
+            temperaments=column(TEMPERAMENT_KEYS, config.temperament),
+        )
+        columns = {
+            CONF_WEIGHT_SENSOR: weights,
+            ATTR_IDEAL: result.ideal_weight.tolist(),
+            ATTR_ENERGY_NEED: result.energy_need.tolist(),
+        }
+
+        for index, timestamp in enumerate(timestamps):
+            start = _hour_start(timestamp)
+            for metric, values in columns.items():
+                value = values[index]
+                if math.isnan(value):
+                    continue
+                hour = self._open_hours.get(metric)
+                if hour is None or hour.start != start:
+                    if hour is not None:
+                        chunk.statistics[metric].append(hour)
+                    hour = self._open_hours[metric] = HourlyStatistic(start)
+                hour.add(value)
@@ -0,0 +1,102 @@
+"""Outlier rejection module."""
+
+from bisect import bisect_left, insort
+from collections import deque
+from collections.abc import Iterable
+
+from .const import DEFAULT_OUTLIER_WINDOW
+
+DEFAULT_OUTLIER_THRESHOLD = 3.5
+MIN_OUTLIER_SAMPLES = 3
+# Floor of the MAD relative to the median, so a window of identical readings
+# does not reject every later change, however small.
+MIN_RELATIVE_MAD = 0.02
+# Consistent rejected readings in a row taken as a real change of the weight.
+STEP_CONFIRMATIONS = 3
+
+
+def _median(values: list[float]) -> float:
+    """Return the median of sorted values."""
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2
+
+
+def _deviates(weight: float, values: list[float], threshold: float) -> bool:
+    """Return whether the modified z-score of weight exceeds threshold."""
+    median = _median(values)
+    mad = _median(sorted(abs(value - median) for value in values))
+    mad = max(mad, abs(median) * MIN_RELATIVE_MAD)
+    if not mad:
+        return weight != median
+    return 0.6745 * abs(weight - median) / mad > threshold
+
+
+class WeightOutlierFilter:
+    """Rolling median/MAD filter over the accepted weight readings.
+
+    A reading is rejected when its modified z-score against the last `window`
+    accepted readings exceeds `threshold`. After STEP_CONFIRMATIONS rejected
+    readings in a row agreeing with each other, the weight is assumed to have
+    really moved and the filter starts over from them.
+    """
+
+    def __init__(
+        self,
+        window: int = DEFAULT_OUTLIER_WINDOW,
+        threshold: float = DEFAULT_OUTLIER_THRESHOLD,
+    ) -> None:
+        if window < MIN_OUTLIER_SAMPLES:
+            raise ValueError(
+                f"Outlier window must be at least {MIN_OUTLIER_SAMPLES} samples."
+            )
+        self.window = window
+        self.threshold = threshold
+        self._samples: deque[float] = deque()
+        self._sorted: list[float] = []
+        self._step: list[float] = []
+        self.accepted = 0
+        self.rejected = 0
+
+    def seed(self, weights: Iterable[float]) -> None:
+        """Fill the window with already accepted readings, without counting them."""
+        for weight in weights:
+            self._add(weight)
+
+    def accept(self, weight: float) -> bool:
+        """Return whether weight is plausible, and keep it in the window if so."""
+        if len(self._samples) >= MIN_OUTLIER_SAMPLES and self._is_outlier(weight):
+            if not self._confirms_step(weight):
+                self.rejected += 1
+                return False
+            # The previous readings of the step were counted as rejected.
+            step, self._step = self._step[:-1], []
+            self._samples.clear()
+            self._sorted.clear()
+            self.seed(step)
+
+        self._step.clear()
+        self.accepted += 1
+        self._add(weight)
+        return True
+
+    def _confirms_step(self, weight: float) -> bool:
+        """Record a rejected reading, return whether it confirms a weight step."""
+        if self._step and _deviates(weight, sorted(self._step), self.threshold):
+            self._step.clear()
+        if weight > 0:
+            self._step.append(weight)
+        return len(self._step) >= STEP_CONFIRMATIONS
+
+    def _is_outlier(self, weight: float) -> bool:
+        """Return whether weight deviates from the accepted readings."""
+        return _deviates(weight, self._sorted, self.threshold)
+
+    def _add(self, weight: float) -> None:
+        """Add weight to the window, dropping the oldest reading when full."""
+        if len(self._samples) == self.window:
+            oldest = self._samples.popleft()
+            del self._sorted[bisect_left(self._sorted, oldest)]
+        self._samples.append(weight)
+        insort(self._sorted, weight)
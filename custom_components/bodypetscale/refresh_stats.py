@@ -0,0 +1,63 @@
+"""Refresh statistics module."""
+
+from bisect import bisect_left
+from typing import Any
+
+# Upper bounds, in milliseconds, of the refresh latency histogram buckets. The
+# last bucket holds every slower refresh.
+LATENCY_BUCKETS_MS: tuple[float, ...] = (1, 2, 5, 10, 25, 50, 100, 250, 1000)
+SLOW_REFRESH_THRESHOLD = 0.1
+
+
+class RefreshStats:
+    """Counters and latency histogram of the refreshes of a coordinator.
+
+    Recording a refresh is a bisect and a few additions, so the statistics are
+    always kept and cost next to nothing when nobody looks at them.
+    """
+
+    def __init__(self) -> None:
+        self.refreshes = 0
+        self.unchanged = 0
+        self.errors = 0
+        self.slow = 0
+        self.last_duration = 0.0
+        self.max_duration = 0.0
+        self.total_duration = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    @property
+    def mean_duration(self) -> float:
+        """Return the mean refresh duration in seconds."""
+        return self.total_duration / self.refreshes if self.refreshes else 0.0
+
+    def record(self, duration: float, *, changed: bool, error: bool) -> bool:
+        """Record a refresh of duration seconds, return whether it was slow."""
+        self.refreshes += 1
+        if error:
+            self.errors += 1
+        elif not changed:
+            self.unchanged += 1
+        self.last_duration = duration
+        self.max_duration = max(self.max_duration, duration)
+        self.total_duration += duration
+        self.buckets[bisect_left(LATENCY_BUCKETS_MS, duration * 1000)] += 1
+        slow = duration > SLOW_REFRESH_THRESHOLD
+        if slow:
+            self.slow += 1
+        return slow
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics as a JSON serializable dict, durations in ms."""
+        bounds = [f"<={bound:g}" for bound in LATENCY_BUCKETS_MS]
+        bounds.append(f">{LATENCY_BUCKETS_MS[-1]:g}")
+        return {
+            "refreshes": self.refreshes,
+            "unchanged": self.unchanged,
+            "errors": self.errors,
+            "slow": self.slow,
+            "last_duration_ms": round(self.last_duration * 1000, 3),
+            "mean_duration_ms": round(self.mean_duration * 1000, 3),
+            "max_duration_ms": round(self.max_duration * 1000, 3),
+            "latency_histogram_ms": dict(zip(bounds, self.buckets, strict=True)),
+        }
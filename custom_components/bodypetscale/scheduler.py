@@ -0,0 +1,120 @@
+"""Life stage transition scheduler for the BodyPetScale integration."""
+
+import heapq
+import itertools
+import logging
+from datetime import date, datetime
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .coordinator import BodyPetScaleCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_LIFE_STAGE_SCHEDULER = f"{DOMAIN}_life_stage_scheduler"
+
+
+class LifeStageScheduler:
+    """Roll every pet over to its next life stage when it is due.
+
+    The next transition of each pet sits in one min-heap and a single timer is
+    armed for the earliest of them, whatever the number of pets.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._heap: list[tuple[datetime, int, BodyPetScaleCoordinator]] = []
+        self._sequence = itertools.count()
+        # Sequence number of the live heap entry of each coordinator, older
+        # entries are stale and skipped when they reach the top of the heap.
+        self._entries: dict[BodyPetScaleCoordinator, int] = {}
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._timer_at: datetime | None = None
+
+    @callback
+    def async_add(self, coordinator: BodyPetScaleCoordinator) -> CALLBACK_TYPE:
+        """Schedule the life stage transitions of coordinator.
+
+        Return a callback cancelling them, to be run when the config entry of
+        the coordinator unloads.
+        """
+        self._async_push(coordinator, dt_util.now().date())
+        self._async_arm()
+
+        @callback
+        def _async_remove() -> None:
+            self.async_remove(coordinator)
+
+        return _async_remove
+
+    @callback
+    def async_remove(self, coordinator: BodyPetScaleCoordinator) -> None:
+        """Cancel the life stage transitions of coordinator."""
+        if self._entries.pop(coordinator, None) is not None:
+            self._async_arm()
+
+    @callback
+    def _async_push(self, coordinator: BodyPetScaleCoordinator, today: date) -> None:
+        """Push the next transition of coordinator after today, if any."""
+        schedule = coordinator.life_stage_schedule
+        boundary = schedule.next_boundary(today) if schedule else None
+        if boundary is None:
+            self._entries.pop(coordinator, None)
+            return
+
+        sequence = next(self._sequence)
+        self._entries[coordinator] = sequence
+        heapq.heappush(
+            self._heap,
+            (dt_util.start_of_local_day(boundary), sequence, coordinator),
+        )
+
+    @callback
+    def _async_arm(self) -> None:
+        """Arm the timer for the earliest live transition."""
+        heap = self._heap
+        while heap and self._entries.get(heap[0][2]) != heap[0][1]:
+            heapq.heappop(heap)
+
+        when = heap[0][0] if heap else None
+        if when == self._timer_at:
+            return
+
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._timer_at = when
+        if when is not None:
+            self._unsub_timer = async_track_point_in_time(
+                self.hass, self._async_handle_timer, when
+            )
+
+    @callback
+    def _async_handle_timer(self, now: datetime) -> None:
+        """Advance every pet whose transition is due."""
+        self._unsub_timer = None
+        self._timer_at = None
+        today = dt_util.as_local(now).date()
+
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _, sequence, coordinator = heapq.heappop(heap)
+            if self._entries.get(coordinator) != sequence:
+                continue
+            _LOGGER.debug("Life stage transition due for %s", coordinator.config.name)
+            coordinator.async_set_age(today)
+            self._async_push(coordinator, today)
+
+        self._async_arm()
+
+
+@callback
+def async_get_life_stage_scheduler(hass: HomeAssistant) -> LifeStageScheduler:
+    """Return the life stage scheduler shared by all config entries."""
+    scheduler: LifeStageScheduler | None = hass.data.get(DATA_LIFE_STAGE_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[DATA_LIFE_STAGE_SCHEDULER] = LifeStageScheduler(hass)
+    return scheduler
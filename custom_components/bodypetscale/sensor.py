@@ -1,6 +1,7 @@
 """Sensor platform for BodyPetScale."""
 
 import logging
+from collections.abc import Callable
 from datetime import datetime
 from typing import Any
 
@@ -11,21 +12,35 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_NAME, UnitOfMass
-from homeassistant.core import Event, EventStateChangedData, HomeAssistant
+from homeassistant.const import (
+    CONF_NAME,
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfMass,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_track_state_change_event
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
-)
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     ATTR_BODY_TYPE,
     ATTR_ENERGY_NEED,
+    ATTR_HOUSEHOLD_ENERGY_NEED,
+    ATTR_HOUSEHOLD_PROBLEM_PETS,
+    ATTR_HOUSEHOLD_WEIGHT_DEVIATION,
     ATTR_IDEAL,
+    ATTR_IDEAL_WEIGHT_ETA,
+    ATTR_LAST_REFRESH_DURATION,
     ATTR_MAIN,
+    ATTR_REFRESH_ERRORS,
+    ATTR_REFRESHES,
+    ATTR_SMOOTHED_WEIGHT,
+    ATTR_WEIGHT_CHANGE_7D,
+    ATTR_WEIGHT_CHANGE_30D,
     CONF_ACTIVITY,
     CONF_ANIMAL_TYPE,
     CONF_APPETITE,
@@ -41,7 +56,12 @@ from .const import (
     VERSION,
 )
 from .coordinator import BodyPetScaleCoordinator
-from .util import get_age_string, get_config_option
+from .core.calculations import get_age_string
+from .dispatcher import async_get_dispatcher
+from .household import HouseholdAggregator, async_get_household
+from .refresh_stats import RefreshStats
+from .shared_scale import async_get_shared_scale_router
+from .util import get_config_option, get_pet_issue
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -80,8 +100,106 @@ SENSORS = [
         translation_key="last_measurement_time",
         device_class=SensorDeviceClass.TIMESTAMP,
     ),
+    SensorEntityDescription(
+        key=ATTR_SMOOTHED_WEIGHT,
+        translation_key="smoothed_weight",
+        icon="mdi:chart-bell-curve-cumulative",
+        native_unit_of_measurement=UnitOfMass.KILOGRAMS,
+        device_class=SensorDeviceClass.WEIGHT,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key=ATTR_WEIGHT_CHANGE_7D,
+        translation_key="weight_change_7d",
+        icon="mdi:trending-up",
+        native_unit_of_measurement=UnitOfMass.KILOGRAMS,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key=ATTR_WEIGHT_CHANGE_30D,
+        translation_key="weight_change_30d",
+        icon="mdi:trending-up",
+        native_unit_of_measurement=UnitOfMass.KILOGRAMS,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key=ATTR_IDEAL_WEIGHT_ETA,
+        translation_key="ideal_weight_eta",
+        icon="mdi:flag-checkered",
+        native_unit_of_measurement=UnitOfTime.DAYS,
+        device_class=SensorDeviceClass.DURATION,
+    ),
+]
+
+# Disabled by default, a disabled entity is never added nor written.
+DIAGNOSTIC_SENSORS = [
+    SensorEntityDescription(
+        key=ATTR_REFRESHES,
+        translation_key="refreshes",
+        icon="mdi:refresh",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    SensorEntityDescription(
+        key=ATTR_REFRESH_ERRORS,
+        translation_key="refresh_errors",
+        icon="mdi:alert-circle-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    SensorEntityDescription(
+        key=ATTR_LAST_REFRESH_DURATION,
+        translation_key="last_refresh_duration",
+        icon="mdi:timer-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+    ),
+]
+
+_REFRESH_STAT_VALUES: dict[str, Callable[[RefreshStats], float]] = {
+    ATTR_REFRESHES: lambda stats: stats.refreshes,
+    ATTR_REFRESH_ERRORS: lambda stats: stats.errors,
+    ATTR_LAST_REFRESH_DURATION: lambda stats: stats.last_duration * 1000,
+}
+
+# Household sensors aggregate every pet, they do not belong to a config entry.
+HOUSEHOLD_SENSORS = [
+    SensorEntityDescription(
+        key=ATTR_HOUSEHOLD_ENERGY_NEED,
+        translation_key="household_energy_need",
+        icon="mdi:food-croissant",
+        native_unit_of_measurement="kcal",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key=ATTR_HOUSEHOLD_PROBLEM_PETS,
+        translation_key="household_problem_pets",
+        icon="mdi:alert-circle-outline",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key=ATTR_HOUSEHOLD_WEIGHT_DEVIATION,
+        translation_key="household_weight_deviation",
+        icon="mdi:scale-unbalanced",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
 ]
 
+_HOUSEHOLD_VALUES: dict[str, Callable[[HouseholdAggregator], float | None]] = {
+    ATTR_HOUSEHOLD_ENERGY_NEED: lambda household: household.total_energy_need,
+    ATTR_HOUSEHOLD_PROBLEM_PETS: lambda household: household.problem_pets,
+    ATTR_HOUSEHOLD_WEIGHT_DEVIATION: lambda household: (
+        household.mean_weight_deviation
+    ),
+}
+
 
 class BasePetSensor(CoordinatorEntity, SensorEntity):
     """Base class for BodyPetScale sensors."""
@@ -89,15 +207,18 @@ class BasePetSensor(CoordinatorEntity, SensorEntity):
     _attr_should_poll = False
     _attr_has_entity_name = True
 
+    coordinator: BodyPetScaleCoordinator
+
     def __init__(
         self,
-        coordinator: DataUpdateCoordinator,
+        coordinator: BodyPetScaleCoordinator,
         config_entry: ConfigEntry,
         description: SensorEntityDescription,
     ) -> None:
         """Initialize a BodyPetScale base sensor."""
         super().__init__(coordinator)
         self.entity_description = description
+        self._last_snapshot: tuple[Any, ...] | None = None
         self._attr_unique_id = f"{config_entry.entry_id}_{description.key}"
         self._activity = get_config_option(config_entry, CONF_ACTIVITY)
         self._appetite = get_config_option(config_entry, CONF_APPETITE)
@@ -125,6 +246,25 @@ class BasePetSensor(CoordinatorEntity, SensorEntity):
             manufacturer="BodyPetScale",
         )
 
+    async def async_added_to_hass(self) -> None:
+        """Remember the state written when the entity is added."""
+        await super().async_added_to_hass()
+        self._last_snapshot = self._state_snapshot()
+
+    def _state_snapshot(self) -> tuple[Any, ...]:
+        """Return what ends up in the written state of the entity."""
+        return (self.available, self.native_value, self.extra_state_attributes)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if availability, value or attributes changed."""
+        snapshot = self._state_snapshot()
+        if snapshot == self._last_snapshot:
+            self.coordinator.skipped_writes += 1
+            return
+        self._last_snapshot = snapshot
+        super()._handle_coordinator_update()
+
     @property
     def native_value(self) -> Any:
         """Return the native value of the sensor.
@@ -144,6 +284,37 @@ class PetMetricSensor(BasePetSensor):
     """Generic sensor for pet metrics (weight, ideal, body type, last measurement)."""
 
 
+class RefreshStatSensor(BasePetSensor):
+    """Diagnostic sensor exposing a refresh statistic of the coordinator.
+
+    Its state is written after every refresh, not only when the coordinator
+    data changes, and failed refreshes are counted rather than making it
+    unavailable.
+    """
+
+    async def async_added_to_hass(self) -> None:
+        """Follow every refresh of the coordinator."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_refresh_listener(self.async_write_ha_state)
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return True, the statistics also cover failed refreshes."""
+        return True
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Ignore data updates, the refresh listener already wrote the state."""
+
+    @property
+    def native_value(self) -> float:
+        """Return the refresh statistic."""
+        key = self.entity_description.key
+        return _REFRESH_STAT_VALUES[key](self.coordinator.refresh_stats)
+
+
 class MainSensor(BasePetSensor):
     """Main sensor that represents the global pet status."""
 
@@ -162,53 +333,54 @@ class MainSensor(BasePetSensor):
         self._birthday = config_entry.data.get(CONF_BIRTHDAY)
         self.coordinator: BodyPetScaleCoordinator = coordinator
         self._morphology = config_entry.data.get(CONF_MORPHOLOGY)
-        self._last_time_sensor = config_entry.data.get(CONF_LAST_TIME_SENSOR)
+        self._last_time_sensor = coordinator.config.last_time_sensor
         self._issue: str | None = None
         self._last_time: datetime | None = None
+        self._status = "ok"
+        self._attributes: dict[str, Any] = {}
 
-    @property
-    def native_value(self) -> str:
+    async def async_added_to_hass(self) -> None:
+        """Compute the status before the first state write."""
+        self._update_status()
+        await super().async_added_to_hass()
+        if self._birthday:
+            # The age moves without any coordinator update.
+            self.async_on_remove(
+                async_track_time_change(
+                    self.hass, self._async_handle_midnight, hour=0, minute=0, second=0
+                )
+            )
+
+    @callback
+    def _async_handle_midnight(self, _now: datetime) -> None:
+        """Write the state, with the age of the new day."""
+        self.async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Compute the status once per update, then write it if it changed."""
+        self._update_status()
+        super()._handle_coordinator_update()
+
+    def _update_status(self) -> None:
+        """Compute the status, issue and attributes from the coordinator data."""
+        self._status = self._compute_status()
+        self._attributes = self._compute_attributes()
+
+    def _compute_status(self) -> str:
         """Return OK or PROBLEM based on weight and last_time validity."""
-        self._issue = None
-        self._last_time = None
-        result = "ok"
-
-        current_weight = self.coordinator.data.get(CONF_WEIGHT_SENSOR)
-
-        if not isinstance(current_weight, (int, float)) or current_weight is None:
-            self._issue = "weight_unavailable"
-            result = "problem"
-        else:
-            try:
-                weight = float(current_weight)
-                if weight == 0:
-                    self._issue = "weight_low"
-                    result = "problem"
-                elif weight >= 100:
-                    self._issue = "weight_high"
-                    result = "problem"
-            except (ValueError, TypeError):
-                self._issue = "weight_unavailable"
-                result = "problem"
-
-        if self._last_time_sensor:
-            last_time = self.coordinator.data.get(CONF_LAST_TIME_SENSOR)
-
-            if not isinstance(last_time, datetime):
-                if isinstance(last_time, str):
-                    self._issue = "last_time_invalid_format"
-                    result = "problem"
-                else:
-                    self._issue = "last_time_unavailable"
-                    result = "problem"
-            else:
-                self._last_time = last_time
-
-        return result
+        data = self.coordinator.data
+        self._issue = get_pet_issue(data, bool(self._last_time_sensor))
+        last_time = data.get(CONF_LAST_TIME_SENSOR)
+        self._last_time = (
+            last_time
+            if self._last_time_sensor and isinstance(last_time, datetime)
+            else None
+        )
+        return "problem" if self._issue else "ok"
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return extra state attributes."""
+    def _compute_attributes(self) -> dict[str, Any]:
+        """Return the extra state attributes."""
         _LOGGER.debug(
             "MainSensor last_measurement_time: %s", self.coordinator.last_time
         )
@@ -236,9 +408,6 @@ class MainSensor(BasePetSensor):
             if value is not None:
                 attrs[key] = value
 
-        if self._birthday:
-            attrs["age"] = get_age_string(self._birthday)
-
         if self._issue:
             attrs["issue"] = self._issue
         if self.coordinator.last_time:
@@ -246,6 +415,21 @@ class MainSensor(BasePetSensor):
 
         return attrs
 
+    @property
+    def native_value(self) -> str:
+        """Return the status computed on the last coordinator update."""
+        return self._status
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the attributes computed on the last coordinator update.
+
+        The age is computed on read, as it changes between updates.
+        """
+        if not self._birthday:
+            return self._attributes
+        return {**self._attributes, "age": get_age_string(self._birthday)}
+
     @property
     def icon(self) -> str:
         """Return an icon depending on the selected animal type (dog, cat, or default scale)."""
@@ -256,6 +440,62 @@ class MainSensor(BasePetSensor):
         return "mdi:scale"
 
 
+class HouseholdSensor(SensorEntity):
+    """Sensor exposing an aggregate across every pet of the household."""
+
+    _attr_should_poll = False
+    _attr_has_entity_name = True
+
+    def __init__(
+        self, household: HouseholdAggregator, description: SensorEntityDescription
+    ) -> None:
+        """Initialize a household sensor."""
+        self.entity_description = description
+        self._household = household
+        self._attr_unique_id = f"{DOMAIN}_{description.key}"
+        self._snapshot: tuple[float | None, int] | None = None
+        self._update_value()
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the household aggregates."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._household.async_add_listener(self._handle_household_update)
+        )
+
+    def _update_value(self) -> bool:
+        """Read the aggregate, return True if the state changed."""
+        value = _HOUSEHOLD_VALUES[self.entity_description.key](self._household)
+        pets = self._household.pets
+        if (value, pets) == self._snapshot:
+            return False
+        self._snapshot = (value, pets)
+        self._attr_native_value = value
+        self._attr_extra_state_attributes = {"pets": pets}
+        return True
+
+    @callback
+    def _handle_household_update(self) -> None:
+        """Write the state if the aggregate changed."""
+        if self._update_value():
+            self.async_write_ha_state()
+
+
+async def async_setup_platform(
+    hass: HomeAssistant,
+    config: ConfigType,
+    async_add_entities: AddEntitiesCallback,
+    discovery_info: DiscoveryInfoType | None = None,
+) -> None:
+    """Set up the household sensors, loaded once for the whole integration."""
+    if discovery_info is None:
+        return
+    household = async_get_household(hass)
+    async_add_entities(
+        HouseholdSensor(household, description) for description in HOUSEHOLD_SENSORS
+    )
+
+
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
@@ -277,7 +517,16 @@ async def async_setup_entry(
 
     main_sensor = MainSensor(coordinator, entry)
 
-    metric_keys = [CONF_WEIGHT_SENSOR, ATTR_IDEAL, ATTR_BODY_TYPE, ATTR_ENERGY_NEED]
+    metric_keys = [
+        CONF_WEIGHT_SENSOR,
+        ATTR_IDEAL,
+        ATTR_BODY_TYPE,
+        ATTR_ENERGY_NEED,
+        ATTR_SMOOTHED_WEIGHT,
+        ATTR_WEIGHT_CHANGE_7D,
+        ATTR_WEIGHT_CHANGE_30D,
+        ATTR_IDEAL_WEIGHT_ETA,
+    ]
 
     if last_time_sensor:
         metric_keys.append(CONF_LAST_TIME_SENSOR)
@@ -289,24 +538,23 @@ async def async_setup_entry(
     ]
 
     entities = [main_sensor] + sensor_entities
+    entities.extend(
+        RefreshStatSensor(coordinator, entry, desc) for desc in DIAGNOSTIC_SENSORS
+    )
 
     async_add_entities(entities)
 
-    # Add a listener to update when the weight sensor or last update sensor changes
+    if coordinator.config.shared_scale:
+        # Readings of a shared scale only go to the pet they are identified as,
+        # the last update sensor is left out as the readings carry their time.
+        entry.async_on_unload(
+            async_get_shared_scale_router(hass).async_add(coordinator)
+        )
+        return
+
+    # Route state changes of the weight and last update sensors to the coordinator
     listeners = [weight_sensor]
     if last_time_sensor:
         listeners.append(last_time_sensor)
 
-    async def async_state_changed_listener(event: Event[EventStateChangedData]) -> None:
-        """Update when the state of monitored sensors changes."""
-        entity_id = event.data["entity_id"]
-
-        if entity_id in listeners:
-            _LOGGER.info(
-                "Monitored sensor %s changed, updating",
-                entity_id,
-            )
-            await coordinator.async_refresh()
-
-    for entity_id in listeners:
-        async_track_state_change_event(hass, entity_id, async_state_changed_listener)
+    entry.async_on_unload(async_get_dispatcher(hass).async_add(coordinator, listeners))
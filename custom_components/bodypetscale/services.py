@@ -0,0 +1,406 @@
+"""Services for the BodyPetScale integration."""
+
+import logging
+from dataclasses import asdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import async_import_statistics
+from homeassistant.const import ATTR_CONFIG_ENTRY_ID, CONF_NAME, UnitOfMass
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.importlib import async_import_module
+from homeassistant.util import dt as dt_util
+
+from .breed_search import DEFAULT_SEARCH_LIMIT, async_get_breed_index
+from .const import (
+    ACTIVITY_LEVELS,
+    ANIMAL_TYPES,
+    ATTR_ENERGY_NEED,
+    ATTR_IDEAL,
+    CONF_ANIMAL_TYPE,
+    CONF_WEIGHT_SENSOR,
+    DOMAIN,
+    LIVING_ENVIRONMENT_OPTIONS,
+    MORPHOLOGY_OPTIONS,
+    REPRODUCTIVE_STATUS,
+)
+from .coordinator import BodyPetScaleCoordinator
+from .feeding import DEFAULT_MEALS_PER_DAY, Food, calculate_portions
+
+if TYPE_CHECKING:
+    from .importer import ImportChunk
+
+_LOGGER = logging.getLogger(__name__)
+
+MAX_GRID_CELLS = 1_000_000
+
+# Options of every animal type, those not applying to a pet are not computable.
+_ALL_ACTIVITY_LEVELS = sorted(
+    {key for keys in ACTIVITY_LEVELS.values() for key in keys}
+)
+_ALL_LIVING_ENVIRONMENTS = sorted(
+    {key for keys in LIVING_ENVIRONMENT_OPTIONS.values() for key in keys}
+)
+
+ATTR_ACTIVITIES = "activities"
+ATTR_CONFIG_ENTRY_IDS = "config_entry_ids"
+ATTR_ENVIRONMENTS = "environments"
+ATTR_FILE_PATH = "file_path"
+ATTR_FOODS = "foods"
+ATTR_KCAL_PER_KG = "kcal_per_kg"
+ATTR_LIMIT = "limit"
+ATTR_MEALS_PER_DAY = "meals_per_day"
+ATTR_MORPHOLOGIES = "morphologies"
+ATTR_QUERY = "query"
+ATTR_REPRODUCTIVES = "reproductives"
+ATTR_WEIGHTS = "weights"
+
+SERVICE_ENERGY_GRID = "energy_grid"
+SERVICE_FEEDING_PLAN = "feeding_plan"
+SERVICE_IMPORT_HISTORY = "import_history"
+SERVICE_SEARCH_BREED = "search_breed"
+
+ENERGY_GRID_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_WEIGHTS): vol.All(
+            cv.ensure_list,
+            [vol.All(vol.Coerce(float), vol.Range(min=0, min_included=False))],
+        ),
+        vol.Optional(ATTR_ACTIVITIES): vol.All(
+            cv.ensure_list, [vol.In(_ALL_ACTIVITY_LEVELS)]
+        ),
+        vol.Optional(ATTR_ENVIRONMENTS): vol.All(
+            cv.ensure_list, [vol.In(_ALL_LIVING_ENVIRONMENTS)]
+        ),
+        vol.Optional(ATTR_MORPHOLOGIES): vol.All(
+            cv.ensure_list, [vol.In(MORPHOLOGY_OPTIONS)]
+        ),
+        vol.Optional(ATTR_REPRODUCTIVES): vol.All(
+            cv.ensure_list, [vol.In(REPRODUCTIVE_STATUS)]
+        ),
+    }
+)
+
+FOOD_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_NAME): cv.string,
+        vol.Required(ATTR_KCAL_PER_KG): vol.All(
+            vol.Coerce(float), vol.Range(min=0, min_included=False)
+        ),
+        vol.Optional(ATTR_MEALS_PER_DAY, default=DEFAULT_MEALS_PER_DAY): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=12)
+        ),
+        vol.Optional(CONF_ANIMAL_TYPE): vol.In(ANIMAL_TYPES),
+    }
+)
+
+FEEDING_PLAN_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_FOODS): vol.All(
+            cv.ensure_list, [FOOD_SCHEMA], vol.Length(min=1)
+        ),
+        vol.Optional(ATTR_CONFIG_ENTRY_IDS): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+IMPORT_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_FILE_PATH): cv.string,
+    }
+)
+
+SEARCH_BREED_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_QUERY): cv.string,
+        vol.Optional(CONF_ANIMAL_TYPE): vol.In(ANIMAL_TYPES),
+        vol.Optional(ATTR_LIMIT, default=DEFAULT_SEARCH_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=50)
+        ),
+    }
+)
+
+_METRIC_UNITS: dict[str, tuple[str, str | None]] = {
+    CONF_WEIGHT_SENSOR: (UnitOfMass.KILOGRAMS, "mass"),
+    ATTR_IDEAL: (UnitOfMass.KILOGRAMS, "mass"),
+    ATTR_ENERGY_NEED: ("kcal", None),
+}
+
+
+def _get_coordinator(hass: HomeAssistant, entry_id: str) -> BodyPetScaleCoordinator:
+    """Return the coordinator of a loaded config entry."""
+    coordinator: BodyPetScaleCoordinator | None = hass.data.get(DOMAIN, {}).get(
+        entry_id
+    )
+    if coordinator is None:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="entry_not_loaded",
+            translation_placeholders={"entry_id": entry_id},
+        )
+    return coordinator
+
+
+def _statistic_ids(hass: HomeAssistant, entry_id: str) -> dict[str, str]:
+    """Return the statistic id (entity id) of each imported metric of a pet."""
+    registry = er.async_get(hass)
+    statistic_ids = {}
+    for metric in _METRIC_UNITS:
+        entity_id = registry.async_get_entity_id(
+            "sensor", DOMAIN, f"{entry_id}_{metric}"
+        )
+        if entity_id is not None:
+            statistic_ids[metric] = entity_id
+    return statistic_ids
+
+
+@callback
+def _async_import_chunk(
+    hass: HomeAssistant, statistic_ids: dict[str, str], chunk: "ImportChunk"
+) -> None:
+    """Queue the hourly statistics of a chunk for import by the recorder."""
+    for metric, hours in chunk.statistics.items():
+        statistic_id = statistic_ids.get(metric)
+        if statistic_id is None or not hours:
+            continue
+        unit, unit_class = _METRIC_UNITS[metric]
+        metadata = StatisticMetaData(
+            has_sum=False,
+            mean_type=StatisticMeanType.ARITHMETIC,
+            name=None,
+            source="recorder",
+            statistic_id=statistic_id,
+            unit_class=unit_class,
+            unit_of_measurement=unit,
+        )
+        async_import_statistics(
+            hass,
+            metadata,
+            [
+                StatisticData(
+                    start=hour.start, mean=hour.mean, min=hour.min, max=hour.max
+                )
+                for hour in hours
+            ],
+        )
+
+
+async def _async_import_history(call: ServiceCall) -> ServiceResponse:
+    """Import historical weigh-ins of a pet as long-term statistics."""
+    hass = call.hass
+    entry_id: str = call.data[ATTR_CONFIG_ENTRY_ID]
+    path = Path(call.data[ATTR_FILE_PATH])
+    coordinator = _get_coordinator(hass, entry_id)
+
+    if not hass.config.is_allowed_path(str(path)):
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="path_not_allowed",
+            translation_placeholders={"path": str(path)},
+        )
+
+    # The importer pulls in numpy, only load it once an import is requested.
+    importer_module = await async_import_module(hass, f"{__package__}.importer")
+    statistic_ids = _statistic_ids(hass, entry_id)
+    importer = importer_module.WeighInImporter(
+        path, coordinator.config, dt_util.get_default_time_zone()
+    )
+    recorder = get_instance(hass)
+    rows = skipped = 0
+
+    try:
+        await hass.async_add_executor_job(importer.open)
+    except OSError as err:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="file_not_readable",
+            translation_placeholders={"path": str(path), "error": str(err)},
+        ) from err
+
+    try:
+        while chunk := await hass.async_add_executor_job(importer.read_chunk):
+            rows += chunk.rows
+            skipped += chunk.skipped
+            _async_import_chunk(hass, statistic_ids, chunk)
+            # Let the recorder catch up, so queued statistics do not pile up.
+            await recorder.async_block_till_done()
+        _async_import_chunk(hass, statistic_ids, importer.flush())
+    finally:
+        await hass.async_add_executor_job(importer.close)
+
+    _LOGGER.info(
+        "Imported %s weigh-ins (%s skipped) from %s for %s",
+        rows - skipped,
+        skipped,
+        path,
+        coordinator.config.name,
+    )
+    result: dict[str, Any] = {"imported": rows - skipped, "skipped": skipped}
+    return result
+
+
+async def _async_energy_grid(call: ServiceCall) -> ServiceResponse:
+    """Return the energy needs of a pet over every combination of factors."""
+    hass = call.hass
+    entry_id: str = call.data[ATTR_CONFIG_ENTRY_ID]
+    coordinator = _get_coordinator(hass, entry_id)
+    config = coordinator.config
+
+    schedule = coordinator.life_stage_schedule
+    if schedule is None:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="no_life_stage",
+            translation_placeholders={"name": config.name},
+        )
+    weights = call.data.get(ATTR_WEIGHTS)
+    if not weights:
+        weight = (coordinator.data or {}).get(CONF_WEIGHT_SENSOR)
+        if not weight:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="weight_unavailable",
+                translation_placeholders={"name": config.name},
+            )
+        weights = [weight]
+
+    # The grid pulls in numpy, only load it once a grid is requested.
+    energy_grid = await async_import_module(hass, f"{__package__}.energy_grid")
+    profile = energy_grid.GridProfile(
+        animal_type=config.animal_type,
+        breed=config.breed,
+        age_months=schedule.age_months_at(dt_util.now().date()),
+        appetite=config.appetite,
+        temperament=config.temperament,
+    )
+    axes = energy_grid.get_grid_axes(
+        config.animal_type,
+        weights,
+        call.data.get(ATTR_ACTIVITIES),
+        call.data.get(ATTR_ENVIRONMENTS),
+        call.data.get(ATTR_MORPHOLOGIES),
+        call.data.get(ATTR_REPRODUCTIVES),
+    )
+    if axes.size > MAX_GRID_CELLS:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="grid_too_large",
+            translation_placeholders={
+                "size": str(axes.size),
+                "max_size": str(MAX_GRID_CELLS),
+            },
+        )
+
+    return await hass.async_add_executor_job(
+        energy_grid.energy_grid_response, profile, axes
+    )
+
+
+async def _async_feeding_plan(call: ServiceCall) -> ServiceResponse:
+    """Return the food portions of the selected pets, or of all of them.
+
+    Portions are computed from the energy needs of the last refresh, no pet is
+    refreshed.
+    """
+    hass = call.hass
+    if ATTR_CONFIG_ENTRY_IDS in call.data:
+        coordinators = {
+            entry_id: _get_coordinator(hass, entry_id)
+            for entry_id in call.data[ATTR_CONFIG_ENTRY_IDS]
+        }
+    else:
+        coordinators = dict(hass.data.get(DOMAIN, {}))
+
+    foods = [
+        Food(
+            name=food[CONF_NAME],
+            kcal_per_kg=food[ATTR_KCAL_PER_KG],
+            meals_per_day=food[ATTR_MEALS_PER_DAY],
+            animal_type=food.get(CONF_ANIMAL_TYPE),
+        )
+        for food in call.data[ATTR_FOODS]
+    ]
+    energy_needs = [
+        (coordinator.data or {}).get(ATTR_ENERGY_NEED)
+        for coordinator in coordinators.values()
+    ]
+    animal_types = [
+        coordinator.config.animal_type for coordinator in coordinators.values()
+    ]
+    plan = calculate_portions(energy_needs, animal_types, foods)
+
+    return {
+        "pets": [
+            {
+                ATTR_CONFIG_ENTRY_ID: entry_id,
+                CONF_NAME: coordinator.config.name,
+                CONF_ANIMAL_TYPE: animal_type,
+                ATTR_ENERGY_NEED: energy_need,
+                "portions": [asdict(portion) for portion in portions],
+            }
+            for (entry_id, coordinator), animal_type, energy_need, portions in zip(
+                coordinators.items(), animal_types, energy_needs, plan, strict=True
+            )
+        ]
+    }
+
+
+async def _async_search_breed(call: ServiceCall) -> ServiceResponse:
+    """Return the breeds best matching a free-text name."""
+    index = await async_get_breed_index(call.hass, call.hass.config.language)
+    matches = index.search(
+        call.data[ATTR_QUERY],
+        call.data.get(CONF_ANIMAL_TYPE),
+        call.data[ATTR_LIMIT],
+    )
+    return {"matches": [asdict(match) for match in matches]}
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the BodyPetScale services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_ENERGY_GRID,
+        _async_energy_grid,
+        schema=ENERGY_GRID_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FEEDING_PLAN,
+        _async_feeding_plan,
+        schema=FEEDING_PLAN_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_IMPORT_HISTORY,
+        _async_import_history,
+        schema=IMPORT_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SEARCH_BREED,
+        _async_search_breed,
+        schema=SEARCH_BREED_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
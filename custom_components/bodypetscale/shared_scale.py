@@ -0,0 +1,194 @@
+"""Shared scale pet identification for the BodyPetScale integration."""
+
+import logging
+from bisect import bisect_left, insort
+from collections import deque
+from statistics import median
+
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+)
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import DOMAIN
+from .coordinator import BodyPetScaleCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_SHARED_SCALES = f"{DOMAIN}_shared_scales"
+# Largest relative difference between a reading and the reference weight of
+# a pet for the reading to be assigned to it.
+SHARED_SCALE_TOLERANCE = 0.2
+# Latest readings of a pet its reference weight is the median of.
+SHARED_SCALE_RECENT_READINGS = 5
+
+
+class SharedScale:
+    """Pets weighed on one scale, sorted by their reference weight.
+
+    The reference weight of a pet is the median of its recent readings, from
+    its weight history then from the readings assigned to it, so a single
+    odd reading does not move it. A reading is assigned to the pet whose
+    reference weight is relatively closest, which is one of the two pets
+    around its bisection point.
+    """
+
+    def __init__(self) -> None:
+        self._bands: list[tuple[float, int]] = []
+        self._references: dict[int, float] = {}
+        self._recent: dict[int, deque[float]] = {}
+        self._coordinators: dict[int, BodyPetScaleCoordinator] = {}
+        # Pets without any recorded weight, offered readings matching no one.
+        self._unweighed: list[int] = []
+
+    def __bool__(self) -> bool:
+        """Return whether any pet uses the scale."""
+        return bool(self._coordinators)
+
+    def add(self, coordinator: BodyPetScaleCoordinator) -> None:
+        """Add the pet of coordinator to the scale."""
+        key = id(coordinator)
+        self._coordinators[key] = coordinator
+        recent = self._recent[key] = deque(
+            (weight for _, weight in coordinator.history),
+            maxlen=SHARED_SCALE_RECENT_READINGS,
+        )
+        if recent:
+            self._set_reference(key, median(recent))
+        else:
+            self._unweighed.append(key)
+
+    def remove(self, coordinator: BodyPetScaleCoordinator) -> None:
+        """Remove the pet of coordinator from the scale."""
+        key = id(coordinator)
+        self._coordinators.pop(key, None)
+        self._recent.pop(key, None)
+        if key in self._unweighed:
+            self._unweighed.remove(key)
+        if (reference := self._references.pop(key, None)) is not None:
+            self._bands.pop(bisect_left(self._bands, (reference, key)))
+
+    def identify(self, weight: float) -> BodyPetScaleCoordinator | None:
+        """Return the pet a reading belongs to and add it to its readings."""
+        key = self._closest(weight)
+        if key is None:
+            if not self._unweighed:
+                return None
+            key = self._unweighed.pop(0)
+        recent = self._recent[key]
+        recent.append(weight)
+        self._set_reference(key, median(recent))
+        return self._coordinators[key]
+
+    def _closest(self, weight: float) -> int | None:
+        """Return the pet with the closest reference weight within tolerance."""
+        bands = self._bands
+        index = bisect_left(bands, (weight,))
+        best: int | None = None
+        best_distance = SHARED_SCALE_TOLERANCE
+        for reference, key in bands[max(index - 1, 0) : index + 1]:
+            distance = abs(weight - reference) / reference
+            if distance <= best_distance:
+                best, best_distance = key, distance
+        return best
+
+    def _set_reference(self, key: int, reference: float) -> None:
+        """Move a pet to its new reference weight."""
+        if (previous := self._references.get(key)) is not None:
+            self._bands.pop(bisect_left(self._bands, (previous, key)))
+        self._references[key] = reference
+        insort(self._bands, (reference, key))
+
+
+class SharedScaleRouter:
+    """Assign the readings of shared scales to the pets weighed on them.
+
+    Each shared scale is subscribed once, whatever the number of pets using it,
+    and only the coordinator of the identified pet refreshes.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._scales: dict[str, SharedScale] = {}
+        self._unsubscribers: dict[str, CALLBACK_TYPE] = {}
+
+    @property
+    def entity_ids(self) -> set[str]:
+        """Return the shared scales currently subscribed to."""
+        return set(self._unsubscribers)
+
+    @callback
+    def async_add(self, coordinator: BodyPetScaleCoordinator) -> CALLBACK_TYPE:
+        """Assign readings of the weight sensor of coordinator to its pet.
+
+        Return a callback stopping it, to be run when the config entry of the
+        coordinator unloads.
+        """
+        entity_id = coordinator.config.weight_sensor
+        scale = self._scales.setdefault(entity_id, SharedScale())
+        scale.add(coordinator)
+        if entity_id not in self._unsubscribers:
+            self._unsubscribers[entity_id] = async_track_state_change_event(
+                self.hass, entity_id, self._async_state_changed_listener
+            )
+
+        @callback
+        def _async_remove() -> None:
+            scale.remove(coordinator)
+            if not scale:
+                del self._scales[entity_id]
+                self._unsubscribers.pop(entity_id)()
+
+        return _async_remove
+
+    @callback
+    def _async_state_changed_listener(
+        self, event: Event[EventStateChangedData]
+    ) -> None:
+        """Hand a new reading to the pet it is identified as."""
+        entity_id = event.data["entity_id"]
+        old_state = event.data["old_state"]
+        new_state = event.data["new_state"]
+        if (
+            new_state is None
+            or new_state.state in ["unavailable", "unknown"]
+            or (scale := self._scales.get(entity_id)) is None
+        ):
+            return
+        if old_state is not None and old_state.state == new_state.state:
+            # Only the attributes changed, such as the battery of the scale.
+            return
+        try:
+            weight = float(new_state.state)
+        except ValueError:
+            _LOGGER.warning("Unable to convert state of %s to float", entity_id)
+            return
+        if weight <= 0:
+            return
+
+        coordinator = scale.identify(weight)
+        if coordinator is None:
+            _LOGGER.warning(
+                "Weight %s on shared scale %s matches no pet", weight, entity_id
+            )
+            return
+        _LOGGER.info(
+            "Weight %s on shared scale %s identified as %s",
+            weight,
+            entity_id,
+            coordinator.config.name,
+        )
+        coordinator.async_set_shared_reading(weight, new_state.last_changed)
+
+
+@callback
+def async_get_shared_scale_router(hass: HomeAssistant) -> SharedScaleRouter:
+    """Return the shared scale router shared by all config entries."""
+    router: SharedScaleRouter | None = hass.data.get(DATA_SHARED_SCALES)
+    if router is None:
+        router = hass.data[DATA_SHARED_SCALES] = SharedScaleRouter(hass)
+    return router
@@ -0,0 +1,167 @@
+"""Weight trend module.
+
+Trends are maintained in O(1) per weighing from a few accumulators instead of
+being recomputed from the history: a time-aware EWMA for the smoothed weight
+and, per window, a least-squares regression in which older weighings fade out
+exponentially with the window length.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Any
+
+SECONDS_PER_DAY = 86400.0
+DEFAULT_SMOOTHING_DAYS = 3.0
+TREND_WINDOWS: tuple[int, ...] = (7, 30)
+
+
+@dataclass(frozen=True)
+class TrendSnapshot:
+    """Trend values after the last weighing, None where not known yet."""
+
+    smoothed: float | None = None
+    change_7d: float | None = None
+    change_30d: float | None = None
+    slope_per_day: float | None = None
+
+
+class _DecayedRegression:
+    """Least-squares weight/time regression with exponential forgetting.
+
+    Times are kept relative to the last sample, in days, so the sums stay small
+    and the fit does not lose precision as timestamps grow.
+    """
+
+    def __init__(self, window_days: float) -> None:
+        self.window_days = window_days
+        self.n = 0.0
+        self.sum_t = 0.0
+        self.sum_w = 0.0
+        self.sum_tt = 0.0
+        self.sum_tw = 0.0
+        self.last_day: float | None = None
+
+    def add(self, day: float, weight: float) -> None:
+        """Add a sample taken on day (in days since the epoch)."""
+        if self.last_day is not None:
+            delta = max(day - self.last_day, 0.0)
+            # Move the origin to the new sample, then fade the older samples.
+            self.sum_tt += -2 * delta * self.sum_t + self.n * delta * delta
+            self.sum_tw -= delta * self.sum_w
+            self.sum_t -= self.n * delta
+            decay = math.exp(-delta / self.window_days)
+            self.n *= decay
+            self.sum_t *= decay
+            self.sum_w *= decay
+            self.sum_tt *= decay
+            self.sum_tw *= decay
+        self.last_day = day if self.last_day is None else max(day, self.last_day)
+        self.n += 1.0
+        self.sum_w += weight
+
+    @property
+    def slope(self) -> float | None:
+        """Return the fitted weight change per day, None if undetermined."""
+        denominator = self.n * self.sum_tt - self.sum_t * self.sum_t
+        if self.n < 2 or denominator <= 1e-12:
+            return None
+        return (self.n * self.sum_tw - self.sum_t * self.sum_w) / denominator
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the accumulators as a JSON serializable dict."""
+        return {
+            "n": self.n,
+            "sum_t": self.sum_t,
+            "sum_w": self.sum_w,
+            "sum_tt": self.sum_tt,
+            "sum_tw": self.sum_tw,
+            "last_day": self.last_day,
+        }
+
+    def load(self, data: dict[str, Any]) -> None:
+        """Restore the accumulators from as_dict output."""
+        self.n = float(data["n"])
+        self.sum_t = float(data["sum_t"])
+        self.sum_w = float(data["sum_w"])
+        self.sum_tt = float(data["sum_tt"])
+        self.sum_tw = float(data["sum_tw"])
+        last_day = data["last_day"]
+        self.last_day = None if last_day is None else float(last_day)
+
+
+class WeightTrend:
+    """Smoothed weight and weight change trends of a pet."""
+
+    def __init__(self, smoothing_days: float = DEFAULT_SMOOTHING_DAYS) -> None:
+        self.smoothing_days = smoothing_days
+        self._smoothed: float | None = None
+        self._last_day: float | None = None
+        self._regressions = {
+            window: _DecayedRegression(window) for window in TREND_WINDOWS
+        }
+
+    def add(self, timestamp: float, weight: float) -> None:
+        """Add a weighing taken at timestamp (seconds since the epoch)."""
+        day = timestamp / SECONDS_PER_DAY
+        if self._smoothed is None or self._last_day is None:
+            self._smoothed = weight
+        else:
+            delta = max(day - self._last_day, 0.0)
+            alpha = 1 - math.exp(-delta / self.smoothing_days)
+            self._smoothed += alpha * (weight - self._smoothed)
+        self._last_day = day if self._last_day is None else max(day, self._last_day)
+
+        for regression in self._regressions.values():
+            regression.add(day, weight)
+
+    def snapshot(self) -> TrendSnapshot:
+        """Return the current trend values."""
+        slope_7d = self._regressions[7].slope
+        slope_30d = self._regressions[30].slope
+        return TrendSnapshot(
+            smoothed=self._smoothed,
+            change_7d=None if slope_7d is None else slope_7d * 7,
+            change_30d=None if slope_30d is None else slope_30d * 30,
+            slope_per_day=slope_30d,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the accumulators as a JSON serializable dict."""
+        return {
+            "smoothed": self._smoothed,
+            "last_day": self._last_day,
+            "windows": {
+                str(window): regression.as_dict()
+                for window, regression in self._regressions.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "WeightTrend":
+        """Rebuild a trend from as_dict output, ignoring unknown windows."""
+        trend = cls()
+        trend._smoothed = data.get("smoothed")
+        trend._last_day = data.get("last_day")
+        for window, regression_data in data.get("windows", {}).items():
+            regression = trend._regressions.get(int(window))
+            if regression is not None:
+                regression.load(regression_data)
+        return trend
+
+
+def days_to_reach(
+    target: float | None, snapshot: TrendSnapshot, tolerance: float = 0.05
+) -> int | None:
+    """Return the estimated days until the smoothed weight reaches target.
+
+    None if the weight is not moving towards the target.
+    """
+    if target is None or snapshot.smoothed is None:
+        return None
+    gap = target - snapshot.smoothed
+    if abs(gap) <= tolerance:
+        return 0
+    slope = snapshot.slope_per_day
+    if not slope or gap / slope <= 0:
+        return None
+    return math.ceil(gap / slope)
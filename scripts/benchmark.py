@@ -0,0 +1,271 @@
+"""Benchmark the import, calculation and refresh hot paths of BodyPetScale.
+
+Run through scripts/benchmark. Each benchmark keeps its fastest round, the
+least disturbed by the rest of the machine, and the results are saved to
+.benchmarks/<name>.json with --save. --compare fails when a benchmark got
+slower than the saved baseline by more than --threshold and by more than
+NOISE_FLOOR. On pull requests, CI saves the base branch as a baseline and
+compares the change against it on the same runner, as a warning only.
+"""
+
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# pylint: disable=wrong-import-position,protected-access
+from homeassistant.core import HomeAssistant, State  # noqa: E402
+
+from custom_components.bodypetscale.coordinator import (  # noqa: E402
+    BodyPetScaleCoordinator,
+)
+from custom_components.bodypetscale.core.calculations import (  # noqa: E402
+    EnergyConfig,
+    calculate_energy_need,
+    calculate_ideal_weight,
+    clear_energy_factor_cache,
+    get_common_energy_factor,
+    get_dog_age_stage,
+)
+from custom_components.bodypetscale.core.grid import (  # noqa: E402
+    GridProfile,
+    calculate_energy_grid,
+)
+from custom_components.bodypetscale.energy_grid import get_grid_axes  # noqa: E402
+from custom_components.bodypetscale.util import PetScaleConfig  # noqa: E402
+
+BASELINE_DIR = ROOT / ".benchmarks"
+PACKAGE = "custom_components.bodypetscale"
+CORE_PACKAGE = "bodypetscale_core"
+CORE_PATH = ROOT / "custom_components" / "bodypetscale" / "core"
+CORE_LOADER = (
+    "import importlib.util, sys\n"
+    f"spec = importlib.util.spec_from_file_location({CORE_PACKAGE!r}, "
+    f"{str(CORE_PATH / '__init__.py')!r}, "
+    f"submodule_search_locations=[{str(CORE_PATH)!r}])\n"
+    "sys.modules[spec.name] = importlib.util.module_from_spec(spec)\n"
+    "spec.loader.exec_module(sys.modules[spec.name])\n"
+)
+# Three runs in a row on one machine differed by up to 15%, twice that is
+# taken as a regression.
+DEFAULT_THRESHOLD = 0.3
+# Slowdowns below a microsecond per call are timer and cache noise.
+NOISE_FLOOR = 1e-6
+PET_COUNTS = (1, 100, 1000)
+ROUNDS = 7
+
+ENERGY_CONFIG = EnergyConfig(
+    animal_type="dog",
+    breed="golden_retriever",
+    life_stage="adult",
+    activity="normal",
+    reproductive="neutered",
+    morphology="5_ideal",
+    environment="indoors",
+    appetite="normal",
+    temperament="calm",
+)
+
+GRID_PROFILE = GridProfile(
+    animal_type="dog", breed="golden_retriever", age_months=48, appetite="normal"
+)
+# 100 weights over every option of a dog, 81000 cells.
+GRID_AXES = get_grid_axes("dog", [10 + i * 0.5 for i in range(100)])
+
+
+class StubStates:
+    """Minimal stand-in for hass.states, holding plain State objects."""
+
+    def __init__(self) -> None:
+        self._states: dict[str, State] = {}
+
+    def get(self, entity_id: str) -> State | None:
+        """Return the state of entity_id."""
+        return self._states.get(entity_id)
+
+    def set(self, entity_id: str, state: str) -> None:
+        """Set the state of entity_id."""
+        self._states[entity_id] = State(entity_id, state)
+
+
+def _time_sync(func: Callable[[], Any], number: int) -> float:
+    """Return the fastest time of one call of func, in seconds."""
+    timer = timeit.Timer(func)
+    return min(timer.repeat(ROUNDS, number)) / number
+
+
+async def _time_async(func: Callable[[], Awaitable[Any]]) -> float:
+    """Return the fastest time of one awaited call of func, in seconds."""
+    samples = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        await func()
+        samples.append(time.perf_counter() - start)
+    return min(samples)
+
+
+def _import_time(modules: tuple[str, ...], setup: str = "") -> float:
+    """Return the fastest cold import time of modules in a fresh interpreter."""
+    samples = []
+    for _ in range(ROUNDS):
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-X",
+                "importtime",
+                "-c",
+                f"{setup}import {modules[-1]}",
+            ],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        total = 0
+        for line in result.stderr.splitlines():
+            _, cumulative, name = line.split("|")
+            if name.strip() in modules:
+                total += int(cumulative)
+        samples.append(total / 1e6)
+    return min(samples)
+
+
+def _bench_import() -> dict[str, float]:
+    """Benchmark a cold import of the integration and of its calculation core."""
+    return {
+        "import_package": _import_time((PACKAGE,)),
+        # The core on its own, without Home Assistant nor the integration,
+        # loaded like scripts/calculate.py does.
+        "import_core": _import_time((f"{CORE_PACKAGE}.calculations",), CORE_LOADER),
+    }
+
+
+def _bench_calculations() -> dict[str, float]:
+    """Benchmark the util calculation functions."""
+
+    def energy_factor_uncached() -> float:
+        clear_energy_factor_cache()
+        return get_common_energy_factor(ENERGY_CONFIG)
+
+    return {
+        "calculate_ideal_weight": _time_sync(
+            lambda: calculate_ideal_weight(31.5, "7_overweight", "dog"), 100_000
+        ),
+        "get_common_energy_factor": _time_sync(
+            lambda: get_common_energy_factor(ENERGY_CONFIG), 100_000
+        ),
+        "get_common_energy_factor_uncached": _time_sync(energy_factor_uncached, 10_000),
+        "calculate_energy_need": _time_sync(
+            lambda: calculate_energy_need(ENERGY_CONFIG, 29.0), 100_000
+        ),
+        "get_dog_age_stage": _time_sync(
+            lambda: get_dog_age_stage("2021-03-14", 29.0), 20_000
+        ),
+        "calculate_energy_grid": _time_sync(
+            lambda: calculate_energy_grid(GRID_PROFILE, GRID_AXES), 20
+        ),
+    }
+
+
+async def _bench_coordinators() -> dict[str, float]:
+    """Benchmark a full coordinator update of every pet, at several pet counts."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        states = StubStates()
+        hass.states = states  # type: ignore[assignment]
+
+        results = {}
+        for count in PET_COUNTS:
+            coordinators = []
+            for index in range(count):
+                config = PetScaleConfig(
+                    weight_sensor=f"sensor.pet_{index}_weight",
+                    last_time_sensor=f"sensor.pet_{index}_last_time",
+                    activity="normal",
+                    appetite="normal",
+                    animal_type="dog" if index % 2 else "cat",
+                    birthday="2021-03-14",
+                    breed="golden_retriever" if index % 2 else "siamese",
+                    environment="indoors",
+                    morphology="5_ideal",
+                    name=f"Pet {index}",
+                    reproductive="neutered",
+                    temperament="calm",
+                )
+                states.set(config.last_time_sensor, "2026-01-01T08:00:00+00:00")
+                coordinators.append(BodyPetScaleCoordinator(hass, config))
+
+            weights = iter(range(1_000_000))
+
+            async def update_all() -> None:
+                # A new plausible weight on every pet, so every output recomputes.
+                weight = str(10 + next(weights) % 2 / 100)
+                for coordinator in coordinators:
+                    states.set(coordinator.config.weight_sensor, weight)
+                    coordinator.data = await coordinator._async_update_data()
+
+            await update_all()
+            results[f"coordinator_update_{count}_pets"] = await _time_async(update_all)
+        return results
+
+
+def _compare(
+    results: dict[str, float], baseline: dict[str, float], threshold: float
+) -> bool:
+    """Print the change against baseline, return whether nothing regressed."""
+    ok = True
+    for name, seconds in results.items():
+        if name not in baseline:
+            continue
+        change = seconds / baseline[name] - 1
+        regressed = change > threshold and seconds - baseline[name] > NOISE_FLOOR
+        ok &= not regressed
+        print(f"{name:40} {change:+8.1%}{'  REGRESSION' if regressed else ''}")
+    return ok
+
+
+def main() -> int:
+    """Run the benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--save", metavar="NAME", help="save the results as NAME")
+    parser.add_argument("--compare", metavar="NAME", help="compare with baseline NAME")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="allowed slowdown against the baseline (default: %(default)s)",
+    )
+    args = parser.parse_args()
+
+    results = _bench_import()
+    results.update(_bench_calculations())
+    results.update(asyncio.run(_bench_coordinators()))
+    for name, seconds in results.items():
+        print(f"{name:40} {seconds * 1e6:12.2f} us")
+
+    if args.save:
+        BASELINE_DIR.mkdir(exist_ok=True)
+        path = BASELINE_DIR / f"{args.save}.json"
+        path.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"Saved baseline {path}")
+
+    if args.compare:
+        path = BASELINE_DIR / f"{args.compare}.json"
+        baseline = json.loads(path.read_text(encoding="utf-8"))
+        if not _compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+"""Calculate ideal weights, life stages and energy needs of a roster offline.
+
+Run through scripts/calculate. Rows are read from a CSV or JSONL file (or
+stdin), with the columns named after the options of the integration plus
+weight and either birthday or age_months, and written with the ideal_weight,
+life_stage and energy_need columns appended, in input order, as they are
+computed. Only the calculation core is loaded, not Home Assistant. With
+--jobs, chunks of rows are computed by that many worker processes, with a
+bounded number of chunks in flight so memory stays flat whatever the size of
+the input.
+"""
+
+import argparse
+import csv
+import importlib.util
+import json
+import logging
+import math
+import sys
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import date
+from itertools import islice
+from pathlib import Path
+from typing import IO, Any
+
+ROOT = Path(__file__).resolve().parent.parent
+CORE = ROOT / "custom_components" / "bodypetscale" / "core"
+
+# The core is loaded as a package of its own name, as a top-level "core" could
+# be any package and its parent would import Home Assistant.
+_spec = importlib.util.spec_from_file_location(
+    "bodypetscale_core", CORE / "__init__.py", submodule_search_locations=[str(CORE)]
+)
+sys.modules[_spec.name] = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(sys.modules[_spec.name])
+
+# pylint: disable=wrong-import-position
+from bodypetscale_core.calculations import (  # noqa: E402
+    EnergyConfig,
+    calculate_energy_need,
+    calculate_ideal_weight,
+    get_cat_life_stage,
+    get_dog_life_stage,
+)
+
+Row = dict[str, Any]
+
+FORMATS = ("csv", "jsonl")
+DEFAULT_CHUNK_SIZE = 1000
+# Chunks submitted ahead of the one being written, per worker.
+CHUNKS_PER_JOB = 2
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _text(row: Row, key: str) -> str | None:
+    """Return the stripped value of a column, None if missing or empty."""
+    value = row.get(key)
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _number(row: Row, key: str) -> float | None:
+    """Return the value of a numeric column, None if missing or invalid."""
+    value = _text(row, key)
+    if value is None:
+        return None
+    try:
+        number = float(value)
+    except ValueError:
+        number = math.nan
+    if not math.isfinite(number):
+        _LOGGER.warning("Invalid %s: %s", key, value)
+        return None
+    return number
+
+
+def _age_months(row: Row, today: date) -> int | None:
+    """Return the age of a row from its age_months or birthday column."""
+    age_months = _number(row, "age_months")
+    if age_months is not None:
+        return int(age_months)
+    birthday = _text(row, "birthday")
+    if birthday is None:
+        return None
+    try:
+        born = date.fromisoformat(birthday)
+    except ValueError:
+        _LOGGER.warning("Invalid birthday: %s", birthday)
+        return None
+    # Same count as get_age_in_months, at today rather than the current day.
+    months = (today.year - born.year) * 12 + today.month - born.month
+    return months - 1 if today.day < born.day else months
+
+
+def calculate_row(row: Row, today: date) -> Row:
+    """Return a row with its ideal weight, life stage and energy need."""
+    animal_type = _text(row, "animal_type")
+    morphology = _text(row, "morphology")
+    weight = _number(row, "weight")
+    ideal_weight = calculate_ideal_weight(weight, morphology, animal_type)
+
+    life_stage = None
+    age_months = _age_months(row, today)
+    if age_months is not None:
+        if animal_type == "cat":
+            life_stage = get_cat_life_stage(age_months)
+        elif animal_type == "dog" and weight is not None:
+            life_stage = get_dog_life_stage(age_months, weight)
+
+    energy_need = None
+    if ideal_weight is not None and life_stage is not None:
+        energy_need = calculate_energy_need(
+            EnergyConfig(
+                animal_type=animal_type,
+                breed=_text(row, "breed"),
+                life_stage=life_stage,
+                activity=_text(row, "activity"),
+                reproductive=_text(row, "reproductive"),
+                morphology=morphology,
+                environment=_text(row, "living_environment"),
+                appetite=_text(row, "appetite"),
+                temperament=_text(row, "temperament"),
+            ),
+            ideal_weight,
+        )
+
+    return {
+        **row,
+        "ideal_weight": ideal_weight,
+        "life_stage": life_stage,
+        "energy_need": energy_need,
+    }
+
+
+def calculate_chunk(rows: list[Row], today: date) -> list[Row]:
+    """Calculate a chunk of rows, in a worker process with --jobs."""
+    return [calculate_row(row, today) for row in rows]
+
+
+def _init_worker(level: int) -> None:
+    """Log in a worker process at the level of the parent."""
+    logging.basicConfig(level=level)
+
+
+def _chunks(rows: Iterable[Row], size: int) -> Iterator[list[Row]]:
+    """Yield the rows in lists of at most size."""
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def calculate_rows(
+    rows: Iterable[Row],
+    today: date,
+    jobs: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Row]:
+    """Yield the calculated rows in input order.
+
+    With jobs above 1, the chunks are computed by that many worker processes,
+    never more than CHUNKS_PER_JOB per worker being read ahead.
+    """
+    if jobs < 2:
+        for row in rows:
+            yield calculate_row(row, today)
+        return
+
+    pending: deque[Future[list[Row]]] = deque()
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(logging.getLogger().level,),
+    ) as pool:
+        for chunk in _chunks(rows, chunk_size):
+            pending.append(pool.submit(calculate_chunk, chunk, today))
+            if len(pending) >= jobs * CHUNKS_PER_JOB:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def read_rows(stream: IO[str], file_format: str) -> Iterator[Row]:
+    """Yield the rows of a CSV or JSONL stream one at a time."""
+    if file_format == "csv":
+        yield from csv.DictReader(stream)
+        return
+    for number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON on line {number}: {e}") from e
+        if not isinstance(row, dict):
+            raise ValueError(f"Line {number} is not a JSON object")
+        yield row
+
+
+def write_rows(stream: IO[str], file_format: str, rows: Iterable[Row]) -> int:
+    """Write rows to a CSV or JSONL stream as they come, return their count."""
+    count = 0
+    if file_format == "jsonl":
+        for count, row in enumerate(rows, 1):
+            stream.write(json.dumps(row, ensure_ascii=False) + "\n")
+        return count
+
+    writer = None
+    for count, row in enumerate(rows, 1):
+        if writer is None:
+            # The header is the one of the first row, later unknown keys of a
+            # JSONL input are dropped.
+            writer = csv.DictWriter(stream, fieldnames=list(row), extrasaction="ignore")
+            writer.writeheader()
+        writer.writerow(row)
+    return count
+
+
+def _format(path: str, forced: str | None) -> str:
+    """Return the format of a file from --format or its extension."""
+    if forced:
+        return forced
+    suffix = Path(path).suffix.lower()
+    return "jsonl" if suffix in (".json", ".jsonl", ".ndjson") else "csv"
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    """Open a file, or stdin/stdout for -."""
+    if path == "-":
+        stream = sys.stdin if mode == "r" else sys.stdout
+        return open(stream.fileno(), mode, encoding="utf-8", newline="", closefd=False)
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+def main() -> int:
+    """Run the batch calculator."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", help="CSV or JSONL roster, - for stdin")
+    parser.add_argument(
+        "-o", "--output", default="-", help="output file (default: stdout)"
+    )
+    parser.add_argument(
+        "--format", choices=FORMATS, help="input format (default: from extension)"
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=FORMATS,
+        help="output format (default: from extension, else the input format)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of worker processes (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="rows per chunk sent to a worker (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--date",
+        type=date.fromisoformat,
+        default=date.today(),
+        help="day the ages are computed at, YYYY-MM-DD (default: today)",
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="log the rows not computed"
+    )
+    args = parser.parse_args()
+    if args.jobs < 1 or args.chunk_size < 1:
+        parser.error("--jobs and --chunk-size must be at least 1")
+
+    logging.basicConfig(level=logging.WARNING if args.verbose else logging.CRITICAL)
+    input_format = _format(args.input, args.format)
+    output_format = args.output_format or (
+        _format(args.output, None) if args.output != "-" else input_format
+    )
+
+    with _open(args.input, "r") as source, _open(args.output, "w") as target:
+        rows = calculate_rows(
+            read_rows(source, input_format), args.date, args.jobs, args.chunk_size
+        )
+        try:
+            count = write_rows(target, output_format, rows)
+        except (ValueError, csv.Error) as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 1
+    print(f"Calculated {count} rows", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
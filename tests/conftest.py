@@ -0,0 +1,96 @@
+"""Fixtures for the BodyPetScale tests."""
+
+from collections.abc import Generator
+from datetime import timedelta
+from typing import Any
+from unittest.mock import PropertyMock, patch
+
+import pytest
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.bodypetscale.const import (
+    CONF_ACTIVITY,
+    CONF_ANIMAL_TYPE,
+    CONF_APPETITE,
+    CONF_BIRTHDAY,
+    CONF_BREED,
+    CONF_LIVING_ENVIRONMENT,
+    CONF_MORPHOLOGY,
+    CONF_REFRESH_COOLDOWN,
+    CONF_REPRODUCTIVE,
+    CONF_WEIGHT_SENSOR,
+    DOMAIN,
+)
+
+WEIGHT_SENSOR = "sensor.rex_weight"
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(
+    recorder_mock: Any, enable_custom_integrations: None
+) -> Generator[None]:
+    """Enable the integration, with the recorder it depends on."""
+    yield
+
+
+@pytest.fixture
+def entity_registry_enabled_by_default() -> Generator[None]:
+    """Enable the entities disabled by default, such as the diagnostic ones."""
+    with patch(
+        "homeassistant.helpers.entity.Entity.entity_registry_enabled_default",
+        new_callable=PropertyMock,
+        return_value=True,
+    ):
+        yield
+
+
+async def async_refresh(hass: HomeAssistant) -> None:
+    """Let the debounced refresh run."""
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+    await hass.async_block_till_done()
+
+
+def make_entry(
+    name: str = "Rex",
+    weight_sensor: str = WEIGHT_SENSOR,
+    **options: Any,
+) -> MockConfigEntry:
+    """Return a config entry of an adult golden retriever."""
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title=name,
+        data={
+            CONF_NAME: name,
+            CONF_ANIMAL_TYPE: "dog",
+            CONF_BREED: "golden_retriever",
+            CONF_BIRTHDAY: "2020-01-01",
+            CONF_ACTIVITY: "normal",
+            CONF_REPRODUCTIVE: "neutered",
+            CONF_APPETITE: "normal",
+        },
+        options={
+            CONF_WEIGHT_SENSOR: weight_sensor,
+            CONF_LIVING_ENVIRONMENT: "indoors",
+            CONF_MORPHOLOGY: "5_ideal",
+            CONF_REFRESH_COOLDOWN: 0,
+            **options,
+        },
+    )
+
+
+@pytest.fixture
+async def config_entry(hass: HomeAssistant) -> MockConfigEntry:
+    """Set up a pet weighing 30 kg."""
+    hass.states.async_set(WEIGHT_SENSOR, "30")
+    entry = make_entry()
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
@@ -0,0 +1,46 @@
+"""Tests for the BodyPetScale config flow."""
+
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.bodypetscale.config_flow import get_options_schema
+from custom_components.bodypetscale.const import (
+    CONF_LIVING_ENVIRONMENT,
+    CONF_OUTLIER_WINDOW,
+    CONF_WEIGHT_SENSOR,
+)
+
+from .conftest import WEIGHT_SENSOR, make_entry
+
+
+def _suggested_values(schema) -> dict:
+    """Return the suggested values of the fields of a form schema."""
+    return {
+        str(key): key.description["suggested_value"]
+        for key in schema.schema
+        if key.description and "suggested_value" in key.description
+    }
+
+
+async def test_options_form_suggests_current_values(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """The options form shows the options of the pet on the shared schema."""
+    get_options_schema.cache_clear()
+    result = await hass.config_entries.options.async_init(config_entry.entry_id)
+
+    assert result["type"] is FlowResultType.FORM
+    suggested = _suggested_values(result["data_schema"])
+    assert suggested[CONF_WEIGHT_SENSOR] == WEIGHT_SENSOR
+    assert suggested[CONF_LIVING_ENVIRONMENT] == "indoors"
+    assert CONF_OUTLIER_WINDOW not in suggested
+
+    other = make_entry("Max", "sensor.max_weight", **{CONF_OUTLIER_WINDOW: 20})
+    other.add_to_hass(hass)
+    result = await hass.config_entries.options.async_init(other.entry_id)
+
+    suggested = _suggested_values(result["data_schema"])
+    assert suggested[CONF_WEIGHT_SENSOR] == "sensor.max_weight"
+    assert suggested[CONF_OUTLIER_WINDOW] == 20
+    assert get_options_schema.cache_info().misses == 1
@@ -0,0 +1,125 @@
+"""Tests for the BodyPetScale coordinator."""
+
+from datetime import datetime
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.bodypetscale.const import (
+    CONF_LAST_TIME_SENSOR,
+    CONF_WEIGHT_SENSOR,
+    DOMAIN,
+)
+from custom_components.bodypetscale.coordinator import BodyPetScaleCoordinator
+
+from .conftest import WEIGHT_SENSOR, async_refresh, make_entry
+
+LAST_TIME_SENSOR = "sensor.rex_last_weighing"
+FIRST_WEIGH_IN = "2026-01-05T08:00:00+00:00"
+SECOND_WEIGH_IN = "2026-01-06T08:00:00+00:00"
+THIRD_WEIGH_IN = "2026-01-07T08:00:00+00:00"
+
+
+async def _async_setup_pet(
+    hass: HomeAssistant, entry: MockConfigEntry
+) -> BodyPetScaleCoordinator:
+    """Set up a pet and return its coordinator."""
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return hass.data[DOMAIN][entry.entry_id]
+
+
+def _timestamp(value: str) -> float:
+    """Return the timestamp of an ISO 8601 time."""
+    return datetime.fromisoformat(value).timestamp()
+
+
+async def test_history_keeps_one_sample_per_weigh_in(hass: HomeAssistant) -> None:
+    """Weigh-ins are recorded at their own time, repeated weights included."""
+    hass.states.async_set(WEIGHT_SENSOR, "30")
+    hass.states.async_set(LAST_TIME_SENSOR, FIRST_WEIGH_IN)
+    coordinator = await _async_setup_pet(
+        hass, make_entry(**{CONF_LAST_TIME_SENSOR: LAST_TIME_SENSOR})
+    )
+
+    # The scale going away and back is not a weigh-in.
+    hass.states.async_set(WEIGHT_SENSOR, "unavailable")
+    await async_refresh(hass)
+    hass.states.async_set(WEIGHT_SENSOR, "30")
+    await async_refresh(hass)
+    # A new weigh-in at the same weight is one.
+    hass.states.async_set(LAST_TIME_SENSOR, SECOND_WEIGH_IN)
+    await async_refresh(hass)
+
+    assert list(coordinator.history) == [
+        (_timestamp(FIRST_WEIGH_IN), 30.0),
+        (_timestamp(SECOND_WEIGH_IN), 30.0),
+    ]
+
+
+async def test_history_without_last_time_sensor(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """Without a last time, only a change of weight is a new weigh-in."""
+    coordinator: BodyPetScaleCoordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+    hass.states.async_set(WEIGHT_SENSOR, "unavailable")
+    await async_refresh(hass)
+    hass.states.async_set(WEIGHT_SENSOR, "30")
+    await async_refresh(hass)
+    hass.states.async_set(WEIGHT_SENSOR, "31")
+    await async_refresh(hass)
+
+    assert [weight for _, weight in coordinator.history] == [30.0, 31.0]
+
+
+async def test_trend_samples_every_weigh_in(hass: HomeAssistant) -> None:
+    """A stable weight is a flat trend, not an unknown one."""
+    hass.states.async_set(WEIGHT_SENSOR, "30")
+    hass.states.async_set(LAST_TIME_SENSOR, FIRST_WEIGH_IN)
+    coordinator = await _async_setup_pet(
+        hass, make_entry(**{CONF_LAST_TIME_SENSOR: LAST_TIME_SENSOR})
+    )
+    for last_time in (SECOND_WEIGH_IN, THIRD_WEIGH_IN):
+        hass.states.async_set(LAST_TIME_SENSOR, last_time)
+        await async_refresh(hass)
+    # Neither a blip of the scale nor a restart adds a sample.
+    hass.states.async_set(WEIGHT_SENSOR, "unavailable")
+    await async_refresh(hass)
+    hass.states.async_set(WEIGHT_SENSOR, "30")
+    await async_refresh(hass)
+    assert await hass.config_entries.async_reload(coordinator.config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][coordinator.config_entry.entry_id]
+
+    snapshot = coordinator.trend.snapshot()
+    assert snapshot.smoothed == 30.0
+    assert snapshot.change_7d == 0.0
+    assert (
+        coordinator.trend.as_dict()["windows"]["7"]["last_day"]
+        == _timestamp(THIRD_WEIGH_IN) / 86400
+    )
+
+
+async def test_refresh_listeners_see_the_completed_refresh(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """Refresh listeners run once the refresh is stored, failed ones included."""
+    coordinator: BodyPetScaleCoordinator = hass.data[DOMAIN][config_entry.entry_id]
+    seen = []
+    coordinator.async_add_refresh_listener(
+        lambda: seen.append(
+            (coordinator.data[CONF_WEIGHT_SENSOR], coordinator.last_update_success)
+        )
+    )
+
+    hass.states.async_set(WEIGHT_SENSOR, "31")
+    await async_refresh(hass)
+    with patch.object(coordinator, "_async_compute_data", side_effect=ValueError):
+        await coordinator.async_refresh()
+
+    assert seen == [(31.0, True), (31.0, False)]
+    assert coordinator.changed_outputs == frozenset()
+    assert coordinator.refresh_stats.errors == 1
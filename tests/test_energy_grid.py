@@ -0,0 +1,70 @@
+"""Tests for the BodyPetScale energy grid."""
+
+import numpy as np
+import pytest
+
+from custom_components.bodypetscale.core.calculations import (
+    EnergyConfig,
+    calculate_energy_need,
+    calculate_ideal_weight,
+    get_cat_life_stage,
+    get_dog_life_stage,
+)
+from custom_components.bodypetscale.core.grid import GridProfile, calculate_energy_grid
+from custom_components.bodypetscale.energy_grid import get_grid_axes
+
+PROFILES = [
+    GridProfile(
+        animal_type="dog", breed="golden_retriever", age_months=30, appetite="normal"
+    ),
+    GridProfile(
+        animal_type="cat", breed="abyssinian", age_months=30, temperament="calm"
+    ),
+]
+# A small dog, either side of the 21 kg switch of the dog formula, a large dog.
+WEIGHTS = [4.2, 20.9, 21.0, 35.5]
+
+
+@pytest.mark.parametrize("profile", PROFILES, ids=lambda profile: profile.animal_type)
+def test_grid_matches_scalar_calculation(profile: GridProfile) -> None:
+    """Each cell of the grid is the energy need of calculate_energy_need."""
+    axes = get_grid_axes(profile.animal_type, WEIGHTS)
+    grid = calculate_energy_grid(profile, axes)
+
+    assert grid.shape == axes.shape
+    for index in np.ndindex(grid.shape):
+        weight, activity, environment, morphology, reproductive = (
+            values[i]
+            for values, i in zip(
+                (
+                    axes.weights,
+                    axes.activities,
+                    axes.environments,
+                    axes.morphologies,
+                    axes.reproductives,
+                ),
+                index,
+                strict=True,
+            )
+        )
+        life_stage = (
+            get_cat_life_stage(profile.age_months)
+            if profile.animal_type == "cat"
+            else get_dog_life_stage(profile.age_months, weight)
+        )
+        expected = calculate_energy_need(
+            EnergyConfig(
+                animal_type=profile.animal_type,
+                breed=profile.breed,
+                life_stage=life_stage,
+                activity=activity,
+                reproductive=reproductive,
+                morphology=morphology,
+                environment=environment,
+                appetite=profile.appetite,
+                temperament=profile.temperament,
+            ),
+            calculate_ideal_weight(weight, morphology, profile.animal_type),
+        )
+        cell = grid[index]
+        assert (None if np.isnan(cell) else int(cell)) == expected, index
@@ -0,0 +1,67 @@
+"""Tests for the BodyPetScale factor overrides."""
+
+import hashlib
+from collections.abc import Generator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.bodypetscale.core.factors import set_overrides
+from custom_components.bodypetscale.factor_overrides import (
+    FactorOverrides,
+    builtin_tables_hash,
+)
+
+CONTENT = b"breed:\n  golden_retriever: 0.95\n"
+STORAGE_KEY = "bodypetscale.factor_overrides"
+# Tables stored from this same file, validated against other built-in tables.
+STORED_TABLES = {"breed": {"golden_retriever": 0.95, "removed_breed": 2.0}}
+
+
+@pytest.fixture(autouse=True)
+def reset_overrides() -> Generator[None]:
+    """Leave the built-in factors in effect for the other tests."""
+    yield
+    set_overrides({})
+
+
+def _store(hass_storage: dict[str, Any], builtin_hash: str | None) -> None:
+    """Store the tables of CONTENT as validated against builtin_hash."""
+    hass_storage[STORAGE_KEY] = {
+        "version": 1,
+        "key": STORAGE_KEY,
+        "data": {
+            "hash": hashlib.sha256(CONTENT).hexdigest(),
+            "builtin_hash": builtin_hash,
+            "tables": STORED_TABLES,
+        },
+    }
+
+
+@pytest.mark.parametrize(
+    ("builtin_hash", "expected"),
+    [
+        (None, {"breed": {"golden_retriever": 0.95}}),
+        ("stale", {"breed": {"golden_retriever": 0.95}}),
+        (builtin_tables_hash(), STORED_TABLES),
+    ],
+    ids=["unversioned", "stale", "current"],
+)
+async def test_stored_tables_need_the_same_builtin_tables(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    tmp_path: Path,
+    builtin_hash: str | None,
+    expected: dict[str, dict[str, float]],
+) -> None:
+    """Stored tables are only reused if the built-in tables did not change."""
+    hass.config.config_dir = str(tmp_path)
+    (tmp_path / "bodypetscale_factors.yaml").write_bytes(CONTENT)
+    _store(hass_storage, builtin_hash)
+
+    overrides = FactorOverrides(hass)
+    await overrides.async_load()
+
+    assert overrides.tables == expected
@@ -0,0 +1,48 @@
+"""Import time budget of the BodyPetScale integration."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PACKAGE = "custom_components.bodypetscale"
+# Measured around 35 ms for the modules of the integration, Home Assistant and
+# the other dependencies they import excluded.
+IMPORT_BUDGET_MS = 100
+ROUNDS = 2
+
+
+def _import_time_ms() -> tuple[float, bool]:
+    """Return the self import time of the integration modules in a fresh interpreter.
+
+    Also return whether the import loaded numpy.
+    """
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"import sys, {PACKAGE}; print('numpy' in sys.modules)",
+        ],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0
+    for line in result.stderr.splitlines():
+        self_time, _, name = line.removeprefix("import time:").split("|")
+        if self_time.strip().isdigit() and name.strip().startswith(PACKAGE):
+            total += int(self_time)
+    return total / 1000, result.stdout.strip() == "True"
+
+
+def test_import_time_within_budget() -> None:
+    """Importing the integration stays within budget and does not load numpy."""
+    # The first run compiles the bytecode, which is not part of the budget.
+    _import_time_ms()
+    samples = [_import_time_ms() for _ in range(ROUNDS)]
+
+    assert min(duration for duration, _ in samples) < IMPORT_BUDGET_MS
+    assert not any(numpy_loaded for _, numpy_loaded in samples)
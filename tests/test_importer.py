@@ -0,0 +1,91 @@
+"""Tests for the historical weigh-in importer."""
+
+from datetime import UTC
+from pathlib import Path
+
+from custom_components.bodypetscale.const import CONF_WEIGHT_SENSOR
+from custom_components.bodypetscale.importer import ImportChunk, WeighInImporter
+from custom_components.bodypetscale.util import PetScaleConfig
+
+CONFIG = PetScaleConfig(
+    weight_sensor="sensor.rex_weight",
+    last_time_sensor=None,
+    activity="normal",
+    appetite="normal",
+    animal_type="dog",
+    birthday="2020-01-01",
+    breed="golden_retriever",
+    environment="indoors",
+    morphology="5_ideal",
+    name="Rex",
+    reproductive="neutered",
+    temperament="",
+)
+
+
+def _read_all(path: Path) -> tuple[int, int, list[float]]:
+    """Import a whole file, return its rows, skipped rows and hourly weights."""
+    importer = WeighInImporter(path, CONFIG, UTC, chunk_size=2)
+    importer.open()
+    chunks: list[ImportChunk] = []
+    try:
+        while (chunk := importer.read_chunk()) is not None:
+            chunks.append(chunk)
+    finally:
+        importer.close()
+    chunks.append(importer.flush())
+    weights = [
+        hour.mean for chunk in chunks for hour in chunk.statistics[CONF_WEIGHT_SENSOR]
+    ]
+    return (
+        sum(chunk.rows for chunk in chunks),
+        sum(chunk.skipped for chunk in chunks),
+        weights,
+    )
+
+
+def test_malformed_jsonl_line_is_skipped(tmp_path: Path) -> None:
+    """A line that is not valid JSON is counted as skipped, the rest imported."""
+    path = tmp_path / "weights.jsonl"
+    path.write_text(
+        '{"timestamp": "2024-01-01T08:00:00+00:00", "weight": 30}\n'
+        '{"timestamp": 1704186000, "weight": 30.5}\n'
+        '{"timestamp": "2024-01-03T08:00:00+00:00", "weight": \n'
+        "[1, 2]\n"
+        '{"timestamp": "2024-01-04T08:00:00+00:00", "weight": 31}\n',
+        encoding="utf-8",
+    )
+
+    assert _read_all(path) == (5, 2, [30.0, 30.5, 31.0])
+
+
+def test_csv_epoch_timestamps(tmp_path: Path) -> None:
+    """Epoch seconds read as strings from a CSV file are timestamps."""
+    path = tmp_path / "weights.csv"
+    path.write_text(
+        "timestamp,weight\n"
+        "1704100000,30\n"
+        "2024-01-02T08:00:00+00:00,30.5\n"
+        "yesterday,31\n",
+        encoding="utf-8",
+    )
+
+    assert _read_all(path) == (3, 1, [30.0, 30.5])
+
+
+def test_out_of_order_and_non_finite_rows_are_skipped(tmp_path: Path) -> None:
+    """Rows of an earlier hour or with a non-finite weight are skipped."""
+    path = tmp_path / "weights.csv"
+    path.write_text(
+        "timestamp,weight\n"
+        "2024-01-01T08:10:00+00:00,30\n"
+        "2024-01-01T09:10:00+00:00,31\n"
+        "2024-01-01T09:05:00+00:00,32\n"
+        "2024-01-01T08:20:00+00:00,20\n"
+        "2024-01-01T10:00:00+00:00,nan\n"
+        "2024-01-01T10:10:00+00:00,inf\n"
+        "2024-01-01T10:20:00+00:00,33\n",
+        encoding="utf-8",
+    )
+
+    assert _read_all(path) == (7, 3, [30.0, 31.5, 33.0])
@@ -0,0 +1,47 @@
+"""Tests for the setup and reload of BodyPetScale config entries."""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.bodypetscale.const import DOMAIN
+from custom_components.bodypetscale.coordinator import BodyPetScaleCoordinator
+
+from .conftest import WEIGHT_SENSOR
+
+RELOADS = 5
+
+
+async def test_reload_keeps_one_refresh_per_state_change(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """A state change refreshes the pet once, however often it was reloaded."""
+    for _ in range(RELOADS):
+        assert await hass.config_entries.async_reload(config_entry.entry_id)
+        await hass.async_block_till_done()
+    coordinator: BodyPetScaleCoordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+    original = BodyPetScaleCoordinator.async_schedule_refresh
+    scheduled: list[BodyPetScaleCoordinator] = []
+
+    def schedule_refresh(self: BodyPetScaleCoordinator) -> None:
+        scheduled.append(self)
+        original(self)
+
+    with patch.object(
+        BodyPetScaleCoordinator, "async_schedule_refresh", schedule_refresh
+    ):
+        hass.states.async_set(WEIGHT_SENSOR, "31")
+        await hass.async_block_till_done()
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+        await hass.async_block_till_done()
+
+    assert scheduled == [coordinator]
+    assert coordinator.requested_refreshes == 1
+    assert coordinator.data["weight_sensor"] == 31
@@ -0,0 +1,27 @@
+"""Tests for the weight outlier filter."""
+
+from custom_components.bodypetscale.outliers import (
+    STEP_CONFIRMATIONS,
+    WeightOutlierFilter,
+)
+
+
+def test_consistent_step_is_accepted() -> None:
+    """A real weight drop is accepted once confirmed by consistent readings."""
+    outlier_filter = WeightOutlierFilter(window=7)
+    outlier_filter.seed([30.0, 30.1, 29.9, 30.0, 30.2])
+
+    results = [outlier_filter.accept(weight) for weight in (26.5, 26.4, 26.6, 26.5)]
+
+    assert results == [False] * (STEP_CONFIRMATIONS - 1) + [True, True]
+    assert outlier_filter.rejected == STEP_CONFIRMATIONS - 1
+
+
+def test_glitches_are_rejected() -> None:
+    """Isolated or zero readings never replace the accepted weight."""
+    outlier_filter = WeightOutlierFilter(window=7)
+    outlier_filter.seed([30.0] * 7)
+
+    results = [outlier_filter.accept(weight) for weight in (0, 0, 0, 120, 3.0, 30.1)]
+
+    assert results == [False, False, False, False, False, True]
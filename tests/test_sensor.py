@@ -0,0 +1,99 @@
+"""Tests for the BodyPetScale sensors."""
+
+from datetime import datetime
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.bodypetscale.const import (
+    ATTR_HOUSEHOLD_PROBLEM_PETS,
+    ATTR_MAIN,
+    ATTR_REFRESHES,
+    CONF_LAST_TIME_SENSOR,
+    DOMAIN,
+)
+
+from .conftest import WEIGHT_SENSOR, async_refresh, make_entry
+
+
+@pytest.mark.usefixtures("entity_registry_enabled_by_default")
+async def test_refresh_count_follows_unchanged_refreshes(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Refreshes leaving the data unchanged are still counted."""
+    entity_id = entity_registry.async_get_entity_id(
+        "sensor", "bodypetscale", f"{config_entry.entry_id}_{ATTR_REFRESHES}"
+    )
+    assert entity_id is not None
+    refreshes = int(hass.states.get(entity_id).state)
+
+    # Same weight, only an attribute changed: the data stays the same.
+    hass.states.async_set(WEIGHT_SENSOR, "30", {"battery": 80})
+    await async_refresh(hass)
+
+    assert int(hass.states.get(entity_id).state) == refreshes + 1
+
+
+async def test_household_problems_match_main_sensors(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    config_entry: MockConfigEntry,
+) -> None:
+    """The household counts the pets whose main sensor shows a problem."""
+    # The last time sensor is an option, and has no state yet.
+    hass.states.async_set("sensor.max_weight", "8")
+    entry = make_entry(
+        "Max", "sensor.max_weight", **{CONF_LAST_TIME_SENSOR: "sensor.max_last_time"}
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await async_refresh(hass)
+
+    statuses = [
+        hass.states.get(
+            entity_registry.async_get_entity_id(
+                "sensor", DOMAIN, f"{pet.entry_id}_{ATTR_MAIN}"
+            )
+        ).state
+        for pet in (config_entry, entry)
+    ]
+    assert statuses == ["ok", "problem"]
+    problems = entity_registry.async_get_entity_id(
+        "sensor", DOMAIN, f"{DOMAIN}_{ATTR_HOUSEHOLD_PROBLEM_PETS}"
+    )
+    assert int(hass.states.get(problems).state) == statuses.count("problem")
+
+
+async def test_main_sensor_age_follows_the_days(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """The age attribute moves at midnight, without any weigh-in."""
+    local = dt_util.get_default_time_zone()
+    freezer.move_to(dt_util.as_utc(datetime(2026, 2, 28, 12, tzinfo=local)))
+    hass.states.async_set(WEIGHT_SENSOR, "30")
+    entry = make_entry()
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    entity_id = entity_registry.async_get_entity_id(
+        "sensor", DOMAIN, f"{entry.entry_id}_{ATTR_MAIN}"
+    )
+    assert hass.states.get(entity_id).attributes["age"] == "6 years and 1 month"
+
+    midnight = dt_util.as_utc(datetime(2026, 3, 1, tzinfo=local))
+    freezer.move_to(midnight)
+    async_fire_time_changed(hass, midnight)
+    await hass.async_block_till_done()
+
+    assert hass.states.get(entity_id).attributes["age"] == "6 years and 2 months"
@@ -0,0 +1,52 @@
+"""Tests for the BodyPetScale shared scales."""
+
+from types import SimpleNamespace
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.bodypetscale.const import CONF_SHARED_SCALE, DOMAIN
+from custom_components.bodypetscale.coordinator import BodyPetScaleCoordinator
+from custom_components.bodypetscale.history import WeightHistory
+from custom_components.bodypetscale.shared_scale import SharedScale
+
+from .conftest import async_refresh, make_entry
+
+SHARED_SENSOR = "sensor.litter_box_weight"
+
+
+def _pet(*weights: float) -> SimpleNamespace:
+    """Return a stand-in coordinator with a weight history."""
+    history = WeightHistory()
+    for day, weight in enumerate(weights):
+        history.append(day * 86400.0, weight)
+    return SimpleNamespace(history=history)
+
+
+def test_identify_from_recent_history() -> None:
+    """One odd reading does not move the reference weight of a pet."""
+    scale = SharedScale()
+    light, heavy = _pet(4.0, 4.1, 4.0, 3.9), _pet(6.0, 6.1, 5.9)
+    scale.add(light)
+    scale.add(heavy)
+
+    assert scale.identify(4.7) is light
+    # Closer to the last reading of the light pet, but not to its history.
+    assert scale.identify(5.0) is heavy
+
+
+async def test_attribute_update_is_not_a_reading(hass: HomeAssistant) -> None:
+    """A change of the scale attributes alone weighs no pet."""
+    hass.states.async_set(SHARED_SENSOR, "unknown")
+    entry = make_entry(weight_sensor=SHARED_SENSOR, **{CONF_SHARED_SCALE: True})
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator: BodyPetScaleCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    hass.states.async_set(SHARED_SENSOR, "30", {"battery": 90})
+    await async_refresh(hass)
+    hass.states.async_set(SHARED_SENSOR, "30", {"battery": 80})
+    await async_refresh(hass)
+
+    measured_at = hass.states.get(SHARED_SENSOR).last_changed.timestamp()
+    assert list(coordinator.history) == [(measured_at, 30.0)]